@@ -3,10 +3,21 @@ set -euo pipefail
 
 SCRIPT_DIR="$(cd -- "$(dirname -- "${BASH_SOURCE[0]}")" && pwd)"
 APP_SCRIPT="$SCRIPT_DIR/sticky_note.py"
+CONTROL_SOCKET="${XDG_RUNTIME_DIR:-/tmp/sticky-note-$(id -u)}/sticky-note.sock"
+COMMAND="${1:-toggle}"
+
+if [[ -S "$CONTROL_SOCKET" ]]; then
+    if command -v socat >/dev/null 2>&1; then
+        reply="$(printf '%s\n' "$COMMAND" | socat -t 1 - "UNIX-CONNECT:$CONTROL_SOCKET" 2>/dev/null || true)"
+        [[ "$reply" == "ok" ]] && exit 0
+    elif python3 "$APP_SCRIPT" --send "$COMMAND"; then
+        exit 0
+    fi
+fi
 
 if pgrep -f "python3 .*sticky_note.py" >/dev/null; then
     hyprctl dispatch focuswindow "title:Sticky Note" >/dev/null 2>&1 || true
     exit 0
 fi
 
-nohup python3 "$APP_SCRIPT" >/tmp/sticky-note.log 2>&1 &
+nohup python3 "$APP_SCRIPT" --resident >/tmp/sticky-note.log 2>&1 &
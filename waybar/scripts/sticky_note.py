@@ -1,10 +1,40 @@
 #!/usr/bin/env python3
+import argparse
+import ctypes
+import hashlib
 import json
 import os
+import re
+import socket
+import sqlite3
+import struct
 import subprocess
+import sys
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 import tkinter as tk
+import tkinter.font as tkfont
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image, ImageDraw, ImageFont, ImageTk
+except ImportError:
+    Image = None
+
+try:
+    import cairosvg
+except (ImportError, OSError):
+    cairosvg = None
 
 NOTE_BG = "#3b5012"
 GALLERY_BG = "#1f2b0f"
@@ -23,6 +53,19 @@ WINDOW_RATIO = WINDOW_WIDTH / WINDOW_HEIGHT
 ANIM_DURATION_MS = 320
 ANIM_FRAME_MS = 20
 ANIM_MAX_NOTES = 12
+# Opt-in: animate text-bearing cards as pre-scaled bitmaps (needs Pillow) instead of re-wrapping text each frame.
+ANIM_RASTER = os.environ.get("STICKY_NOTE_RASTER_ANIM", "0") == "1"
+ANIM_RASTER_SCALES = (1.0, 0.8, 0.64, 0.5, 0.4, 0.3, 0.22)
+# Level of detail for animated cards: text, spline smoothing and rounded corners drop out as cards shrink.
+ANIM_LOD_TEXT_MIN = 150
+ANIM_LOD_SMOOTH_MIN = 180
+ANIM_LOD_POLYGON_MIN = 90
+ANIM_LOD_MAX_BIAS = 2
+
+GALLERY_VIRTUAL_MIN_NOTES = 48
+GALLERY_OVERSCAN_ROWS = 2
+RESIZE_FRAME_MS = 16
+RESIZE_SETTLE_MS = 180
 
 EDITOR_OUTER_PAD = 10
 EDITOR_SIDEBAR_WIDTH = 68
@@ -38,7 +81,44 @@ SVG_RECOLOR_MAP = (
     "#FEF3C7",
     "#D97706",
 )
-ICON_RENDER_VERSION = "v3"
+ICON_RENDER_VERSION = "v4"
+ICON_SCALES = (1, 2, 3)
+ICON_CACHE_MAX_BYTES = 2 * 1024 * 1024
+ICON_CACHE_MAX_AGE_S = 30 * 24 * 3600
+
+SAVE_FSYNC = os.environ.get("STICKY_NOTE_FSYNC", "0") == "1"
+SAVE_RETRY_S = 1.0
+STATE_SAVE_DELAY_MS = 500
+# Journaled notes are folded back into their base body once the edit log grows past either limit.
+JOURNAL_COMPACT_OPS = 64
+JOURNAL_COMPACT_CHARS = 64 * 1024
+
+# Notes larger than the first chunk stream into the editor in idle-time chunks.
+LOAD_FIRST_CHARS = 32 * 1024
+LOAD_CHUNK_CHARS = 128 * 1024
+NOTE_CACHE_CHARS = 8 * 1024 * 1024
+EDITOR_POOL_SIZE = 4
+EDITOR_POOL_CHARS = 4 * 1024 * 1024
+NOTE_CACHE_MAX_ENTRY = 2 * 1024 * 1024
+
+SEARCH_TOKEN_RE = re.compile(r"\w+")
+SEARCH_TERM_MAX = 64
+SEARCH_DEBOUNCE_MS = 120
+SEARCH_REINDEX_DELAY_MS = 2000
+SEARCH_SPACE_RE = re.compile(r"\s+")
+SEARCH_FUZZY_MIN = 0.5
+SEARCH_RECENCY_WEIGHT = 0.3
+SEARCH_RECENCY_HALF_LIFE_S = 14 * 24 * 3600
+SEARCH_VERIFY_MAX = 40
+SEARCH_VERIFY_CHARS = 1_000_000
+
+WATCH_DEBOUNCE_MS = 150
+WATCH_POLL_MS = 2000
+# Tags every note row this process writes, so the watcher can tell its own saves from other writers'.
+PROCESS_TOKEN = uuid.uuid4().hex
+
+PREVIEW_LINES = 6
+PREVIEW_CHARS = 360
 
 
 def data_dir() -> Path:
@@ -51,16 +131,16 @@ def data_dir() -> Path:
 DATA_DIR = data_dir()
 NOTES_DIR = DATA_DIR / "notes"
 STATE_FILE = DATA_DIR / "state.json"
+DB_FILE = DATA_DIR / "notes.db"
 LEGACY_NOTE_FILE = DATA_DIR / "note.txt"
 CACHE_DIR = DATA_DIR / "cache"
+RUNTIME_DIR = Path(os.environ.get("XDG_RUNTIME_DIR") or f"/tmp/sticky-note-{os.getuid()}")
+CONTROL_SOCKET = RUNTIME_DIR / "sticky-note.sock"
+CONTROL_COMMANDS = ("show", "hide", "toggle", "new", "quit")
 SCRIPT_DIR = Path(__file__).resolve().parent
 NOTES_ICON_SVG = SCRIPT_DIR / "assets" / "notes.svg"
 
 
-def note_file(note_id: str) -> Path:
-    return NOTES_DIR / f"{note_id}.txt"
-
-
 def read_file(path: Path) -> str:
     try:
         return path.read_text(encoding="utf-8")
@@ -68,61 +148,1072 @@ def read_file(path: Path) -> str:
         return ""
 
 
-def write_file(path: Path, content: str) -> None:
-    path.write_text(content, encoding="utf-8")
-
-
 def new_note_id() -> str:
     return uuid.uuid4().hex
 
 
-def save_state(note_ids: list[str], active_id: str) -> None:
-    payload = {"note_ids": note_ids, "active_id": active_id}
-    STATE_FILE.write_text(json.dumps(payload), encoding="utf-8")
+def build_preview(content: str) -> str:
+    # Scan line by line so multi-megabyte notes only pay for their first few lines.
+    lines: list[str] = []
+    start = 0
+    total = len(content)
+    while len(lines) < PREVIEW_LINES and start < total:
+        end = content.find("\n", start)
+        if end < 0:
+            end = total
+        line = content[start:end].rstrip()
+        if line.strip():
+            lines.append(line)
+        start = end + 1
+
+    if not lines:
+        return "(empty)"
+    lines[0] = lines[0].lstrip()
+    return "\n".join(lines)[:PREVIEW_CHARS]
+
+
+def search_terms(content: str) -> set[str]:
+    return {term[:SEARCH_TERM_MAX] for term in SEARCH_TOKEN_RE.findall(content.lower())}
+
+
+def search_trigrams(content: str) -> set[str]:
+    text = SEARCH_SPACE_RE.sub(" ", content.lower())
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def content_hash(content: str) -> bytes:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+
+def apply_edits(body: str, edits) -> str:
+    # Replay over (source, start, stop) pieces so the body is copied once at the end, not once per op.
+    pieces = [(body, 0, len(body))]
+    for pos, remove, text in edits:
+        end = pos + remove
+        replayed = []
+        offset = 0
+        inserted = False
+        for source, start, stop in pieces:
+            length = stop - start
+            left = min(max(pos - offset, 0), length)
+            right = min(max(end - offset, 0), length)
+            if left:
+                replayed.append((source, start, start + left))
+            if not inserted and pos <= offset + length:
+                replayed.append((text, 0, len(text)))
+                inserted = True
+            if right < length:
+                replayed.append((source, start + right, stop))
+            offset += length
+        if not inserted:
+            replayed.append((text, 0, len(text)))
+        pieces = [piece for piece in replayed if piece[1] < piece[2]] or [("", 0, 0)]
+    return "".join(source[start:stop] for source, start, stop in pieces)
+
+
+class NoteOrder:
+    # Gallery order of note ids with constant-time membership, insert, move-to-front and removal.
+    def __init__(self, note_ids=()) -> None:
+        self._ids: OrderedDict[str, None] = OrderedDict.fromkeys(note_ids)
+
+    def __contains__(self, note_id: object) -> bool:
+        return note_id in self._ids
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def front(self) -> str:
+        return next(iter(self._ids), "")
+
+    def first(self, count: int) -> list[str]:
+        return list(islice(self._ids, count))
+
+    def ids(self) -> list[str]:
+        return list(self._ids)
+
+    def insert_front(self, note_id: str) -> None:
+        self._ids[note_id] = None
+        self._ids.move_to_end(note_id, last=False)
+
+    def move_to_front(self, note_id: str) -> None:
+        self._ids.move_to_end(note_id, last=False)
+
+    def append(self, note_id: str) -> None:
+        self._ids[note_id] = None
+
+    def remove(self, note_id: str) -> None:
+        self._ids.pop(note_id, None)
+
+
+class NoteStore:
+    SCHEMA_VERSION = 7
+
+    def __init__(self, path: Path = DB_FILE, durable: bool = False) -> None:
+        self.path = path
+        self.conn = sqlite3.connect(str(path), timeout=5.0, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(f"PRAGMA synchronous={'FULL' if durable else 'NORMAL'}")
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        with self.transaction():
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= self.SCHEMA_VERSION:
+                return
+            if version < 1:
+                self.conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS notes (
+                        id TEXT PRIMARY KEY,
+                        body TEXT NOT NULL DEFAULT '',
+                        position INTEGER NOT NULL DEFAULT 0,
+                        mtime REAL NOT NULL DEFAULT 0
+                    )
+                    """
+                )
+                self.conn.execute("CREATE INDEX IF NOT EXISTS notes_position ON notes(position)")
+                self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            if version < 2:
+                self.conn.execute("ALTER TABLE notes ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+                self.conn.execute("UPDATE notes SET size = length(body)")
+                self.conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS previews (
+                        id TEXT PRIMARY KEY,
+                        mtime REAL NOT NULL,
+                        size INTEGER NOT NULL,
+                        preview TEXT NOT NULL
+                    )
+                    """
+                )
+            if version < 3:
+                self.conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS note_edits (
+                        note_id TEXT NOT NULL,
+                        seq INTEGER NOT NULL,
+                        pos INTEGER NOT NULL,
+                        remove INTEGER NOT NULL,
+                        insert_text TEXT NOT NULL,
+                        PRIMARY KEY (note_id, seq)
+                    ) WITHOUT ROWID
+                    """
+                )
+            if version < 4:
+                self.conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS search_terms (
+                        term TEXT NOT NULL,
+                        note_id TEXT NOT NULL,
+                        PRIMARY KEY (term, note_id)
+                    ) WITHOUT ROWID
+                    """
+                )
+                self.conn.execute("CREATE INDEX IF NOT EXISTS search_terms_note ON search_terms(note_id)")
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS search_docs (note_id TEXT PRIMARY KEY, mtime REAL NOT NULL)"
+                )
+            if version < 5:
+                self.conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS search_trigrams (
+                        gram TEXT NOT NULL,
+                        note_id TEXT NOT NULL,
+                        PRIMARY KEY (gram, note_id)
+                    ) WITHOUT ROWID
+                    """
+                )
+                self.conn.execute("CREATE INDEX IF NOT EXISTS search_trigrams_note ON search_trigrams(note_id)")
+                # Existing documents have words but no trigrams yet; let reconciliation fill them in.
+                self.conn.execute("DELETE FROM search_docs")
+            if version < 6:
+                self.conn.execute("ALTER TABLE notes ADD COLUMN rev INTEGER NOT NULL DEFAULT 0")
+                self.conn.execute("ALTER TABLE notes ADD COLUMN writer TEXT NOT NULL DEFAULT ''")
+                self.conn.execute("CREATE INDEX IF NOT EXISTS notes_rev ON notes(rev)")
+            if version < 7:
+                self.conn.execute("ALTER TABLE notes ADD COLUMN archived INTEGER NOT NULL DEFAULT 0")
+            self.conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    @contextmanager
+    def transaction(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def get_meta(self, key: str, default: str = "") -> str:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
 
+    def order(self) -> list[str]:
+        return [row[0] for row in self.conn.execute("SELECT id FROM notes WHERE archived = 0 ORDER BY position, mtime")]
+
+    def archived(self) -> list[str]:
+        return [row[0] for row in self.conn.execute("SELECT id FROM notes WHERE archived = 1 ORDER BY mtime DESC")]
+
+    def active_id(self) -> str:
+        return self.get_meta("active_id")
+
+    def exists(self, note_id: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM notes WHERE id = ?", (note_id,)).fetchone() is not None
+
+    def read(self, note_id: str) -> str:
+        row = self.conn.execute("SELECT body FROM notes WHERE id = ?", (note_id,)).fetchone()
+        if row is None:
+            return ""
+        edits = self.conn.execute(
+            "SELECT pos, remove, insert_text FROM note_edits WHERE note_id = ? ORDER BY seq",
+            (note_id,),
+        ).fetchall()
+        return apply_edits(row[0], edits) if edits else row[0]
+
+    def size(self, note_id: str) -> int:
+        row = self.conn.execute("SELECT size FROM notes WHERE id = ?", (note_id,)).fetchone()
+        return row[0] if row else 0
+
+    def read_range(self, note_id: str, start: int, length: int) -> str:
+        # Base body only; callers must make sure the note has no journaled edits.
+        row = self.conn.execute(
+            "SELECT substr(body, ?, ?) FROM notes WHERE id = ?",
+            (start + 1, length, note_id),
+        ).fetchone()
+        return row[0] if row else ""
+
+    def mtime(self, note_id: str) -> float:
+        row = self.conn.execute("SELECT mtime FROM notes WHERE id = ?", (note_id,)).fetchone()
+        return row[0] if row else 0.0
+
+    def previews(self, note_ids: list[str]) -> dict[str, str]:
+        found: dict[str, str] = {}
+        stale: list[str] = []
+        # Stay well below SQLite's bound-parameter limit for large galleries.
+        for start in range(0, len(note_ids), 500):
+            chunk = note_ids[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"""
+                SELECT n.id, p.preview, p.mtime = n.mtime AND p.size = n.size
+                FROM notes n LEFT JOIN previews p ON p.id = n.id
+                WHERE n.id IN ({marks})
+                """,
+                chunk,
+            )
+            for note_id, preview, fresh in rows:
+                if fresh:
+                    found[note_id] = preview
+                else:
+                    stale.append(note_id)
+
+        if stale:
+            rows = []
+            for note_id in stale:
+                row = self.conn.execute("SELECT mtime, size FROM notes WHERE id = ?", (note_id,)).fetchone()
+                if row is None:
+                    continue
+                mtime, size = row
+                found[note_id] = build_preview(self.read(note_id))
+                rows.append((note_id, mtime, size, found[note_id]))
+            with self.transaction():
+                self._put_previews(rows)
+        return found
+
+    def _put_previews(self, rows: list[tuple[str, float, int, str]]) -> None:
+        self.conn.executemany(
+            """
+            INSERT INTO previews (id, mtime, size, preview) VALUES (?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET mtime = excluded.mtime, size = excluded.size, preview = excluded.preview
+            """,
+            rows,
+        )
 
-def bootstrap_state() -> tuple[list[str], str]:
-    NOTES_DIR.mkdir(parents=True, exist_ok=True)
+    def _insert_front(self, note_id: str, content: str, mtime: float) -> None:
+        self.conn.execute(
+            """
+            INSERT INTO notes (id, body, position, mtime, size)
+            VALUES (?, ?, (SELECT COALESCE(MIN(position), 0) - 1 FROM notes), ?, ?)
+            """,
+            (note_id, content, mtime, len(content)),
+        )
 
-    existing = [p.stem for p in NOTES_DIR.glob("*.txt") if p.is_file()]
-    existing.sort(key=lambda nid: note_file(nid).stat().st_mtime)
+    def _bump_rev(self, note_id: str | None = None) -> int:
+        # One counter for the whole store; compaction and index upkeep do not change content and skip it.
+        rev = int(self.get_meta("rev", "0")) + 1
+        self._set_meta("rev", str(rev))
+        if note_id is None:
+            self._set_meta("deleted_rev", str(rev))
+        else:
+            self.conn.execute("UPDATE notes SET rev = ?, writer = ? WHERE id = ?", (rev, PROCESS_TOKEN, note_id))
+        return rev
+
+    def last_rev(self) -> int:
+        return int(self.get_meta("rev", "0"))
+
+    def note_rev(self, note_id: str) -> int:
+        row = self.conn.execute("SELECT rev FROM notes WHERE id = ?", (note_id,)).fetchone()
+        return row[0] if row else 0
+
+    def changed_elsewhere(self, note_id: str, rev: int) -> bool:
+        # Our own saves move the rev past the base too, but only another process leaves its token behind.
+        row = self.conn.execute("SELECT rev, writer FROM notes WHERE id = ?", (note_id,)).fetchone()
+        return row is not None and row[0] > rev and row[1] != PROCESS_TOKEN
+
+    def changes_since(self, rev: int) -> tuple[int, list[str], bool]:
+        latest = self.last_rev()
+        if latest <= rev:
+            return rev, [], False
+        changed = [
+            row[0]
+            for row in self.conn.execute(
+                "SELECT id FROM notes WHERE rev > ? AND writer != ?",
+                (rev, PROCESS_TOKEN),
+            )
+        ]
+        return latest, changed, int(self.get_meta("deleted_rev", "0")) > rev
+
+    def _write_body(self, note_id: str, content: str, mtime: float) -> None:
+        # Updates only: a save that lands after its note was deleted must not bring it back.
+        updated = self.conn.execute(
+            "UPDATE notes SET body = ?, mtime = ?, size = ? WHERE id = ?",
+            (content, mtime, len(content), note_id),
+        ).rowcount
+        if updated:
+            self.conn.execute("DELETE FROM note_edits WHERE note_id = ?", (note_id,))
+            self._put_previews([(note_id, mtime, len(content), build_preview(content))])
+
+    def _index_note(self, note_id: str, terms: set[str], grams: set[str], mtime: float) -> None:
+        self._diff_index("search_terms", "term", note_id, terms)
+        self._diff_index("search_trigrams", "gram", note_id, grams)
+        self.conn.execute(
+            "INSERT INTO search_docs (note_id, mtime) VALUES (?, ?) ON CONFLICT(note_id) DO UPDATE SET mtime = excluded.mtime",
+            (note_id, mtime),
+        )
 
-    if not existing:
-        content = read_file(LEGACY_NOTE_FILE) if LEGACY_NOTE_FILE.exists() else ""
-        first = new_note_id()
-        write_file(note_file(first), content)
-        existing = [first]
+    def _diff_index(self, table: str, column: str, note_id: str, keys: set[str]) -> None:
+        # Only the difference against what is already indexed for this note is written.
+        indexed = {row[0] for row in self.conn.execute(f"SELECT {column} FROM {table} WHERE note_id = ?", (note_id,))}
+        self.conn.executemany(
+            f"DELETE FROM {table} WHERE {column} = ? AND note_id = ?",
+            [(key, note_id) for key in indexed - keys],
+        )
+        self.conn.executemany(
+            f"INSERT INTO {table} ({column}, note_id) VALUES (?, ?)",
+            [(key, note_id) for key in keys - indexed],
+        )
 
-    note_ids = existing.copy()
-    active_id = note_ids[0]
+    def stale_search_docs(self) -> list[str]:
+        # Saves only move the note mtime; the index catches up later in a background pass.
+        return [
+            row[0]
+            for row in self.conn.execute(
+                """
+                SELECT n.id FROM notes n LEFT JOIN search_docs d ON d.note_id = n.id
+                WHERE d.mtime IS NULL OR d.mtime != n.mtime
+                """
+            )
+        ]
 
-    if STATE_FILE.exists():
+    def reindex(self, note_id: str) -> None:
+        # Read from one snapshot and tokenize before taking the write lock; a note saved meanwhile stays stale.
+        self.conn.execute("BEGIN")
         try:
-            payload = json.loads(read_file(STATE_FILE))
-            saved_ids = [str(nid) for nid in payload.get("note_ids", [])]
-            filtered_saved = [nid for nid in saved_ids if note_file(nid).exists()]
-            merged = filtered_saved + [nid for nid in note_ids if nid not in filtered_saved]
-            if merged:
-                note_ids = merged
-            saved_active = str(payload.get("active_id", ""))
-            if saved_active in note_ids:
-                active_id = saved_active
-        except Exception:
-            pass
+            row = self.conn.execute("SELECT mtime FROM notes WHERE id = ?", (note_id,)).fetchone()
+            content = self.read(note_id) if row is not None else ""
+        finally:
+            self.conn.execute("COMMIT")
+        if row is None:
+            return
+        terms, grams = search_terms(content), search_trigrams(content)
+        with self.transaction():
+            if self.mtime(note_id) == row[0]:
+                self._index_note(note_id, terms, grams, row[0])
+
+    def reconcile_search_index(self, prune: bool = True) -> None:
+        for note_id in self.stale_search_docs():
+            self.reindex(note_id)
+        if not prune:
+            return
+        with self.transaction():
+            self.conn.execute("DELETE FROM search_docs WHERE note_id NOT IN (SELECT id FROM notes)")
+            self.conn.execute("DELETE FROM search_terms WHERE note_id NOT IN (SELECT id FROM notes)")
+            self.conn.execute("DELETE FROM search_trigrams WHERE note_id NOT IN (SELECT id FROM notes)")
+
+    def search(self, query: str) -> list[str]:
+        # Quality tiers: whole-query substring, then all words present, then trigram overlap for typos.
+        scores: dict[str, float] = {note_id: 1.5 for note_id in self._word_matches(query)}
+        needle = SEARCH_SPACE_RE.sub(" ", query.strip().lower())
+        grams = search_trigrams(needle)
+        complete: list[str] = []
+        if grams:
+            need = max(1, int(len(grams) * SEARCH_FUZZY_MIN + 0.999))
+            marks = ",".join("?" * len(grams))
+            rows = self.conn.execute(
+                f"""
+                SELECT note_id, COUNT(*) FROM search_trigrams WHERE gram IN ({marks})
+                GROUP BY note_id HAVING COUNT(*) >= ?
+                """,
+                [*grams, need],
+            ).fetchall()
+            for note_id, count in rows:
+                if count == len(grams):
+                    complete.append(note_id)
+                scores[note_id] = max(scores.get(note_id, 0.0), count / len(grams))
+        if not scores:
+            return []
 
-    save_state(note_ids, active_id)
-    return note_ids, active_id
+        now = time.time()
+        mtimes: dict[str, float] = {}
+        sizes: dict[str, int] = {}
+        for note_id, mtime, size in self.conn.execute(
+            f"SELECT id, mtime, size FROM notes WHERE id IN ({','.join('?' * len(scores))})", list(scores)
+        ):
+            mtimes[note_id] = mtime
+            sizes[note_id] = size
+        # A needle of one trigram is its own substring check; longer ones read only the best few bodies,
+        # within a character budget so a handful of huge notes cannot stall a keystroke.
+        if len(needle) > 3:
+            complete.sort(key=lambda note_id: (-scores[note_id], -mtimes.get(note_id, 0.0)))
+            verified: list[str] = []
+            budget = SEARCH_VERIFY_CHARS
+            for note_id in complete[:SEARCH_VERIFY_MAX]:
+                size = sizes.get(note_id, 0)
+                if size > budget:
+                    continue
+                budget -= size
+                if needle in SEARCH_SPACE_RE.sub(" ", self.read(note_id).lower()):
+                    verified.append(note_id)
+            complete = verified
+        for note_id in complete:
+            scores[note_id] = 2.0
+        for note_id, mtime in mtimes.items():
+            age = max(0.0, now - mtime)
+            scores[note_id] += SEARCH_RECENCY_WEIGHT * 0.5 ** (age / SEARCH_RECENCY_HALF_LIFE_S)
+        return sorted(mtimes, key=lambda note_id: (-scores[note_id], -mtimes[note_id]))
+
+    def _word_matches(self, query: str) -> set[str]:
+        tokens = SEARCH_TOKEN_RE.findall(query.lower())
+        if not tokens:
+            return set()
+
+        # Every word must match exactly, except the last, which matches as a prefix while typing.
+        clauses: list[str] = []
+        params: list[str] = []
+        for token in tokens[:-1]:
+            clauses.append("SELECT note_id FROM search_terms WHERE term = ?")
+            params.append(token[:SEARCH_TERM_MAX])
+        last = tokens[-1][:SEARCH_TERM_MAX]
+        clauses.append("SELECT note_id FROM search_terms WHERE term >= ? AND term < ?")
+        params.extend([last, last[:-1] + chr(ord(last[-1]) + 1)])
+        return {row[0] for row in self.conn.execute(" INTERSECT ".join(clauses), params)}
+
+    def _append_edits(self, note_id: str, edits: list, size: int, preview: str, mtime: float) -> int:
+        updated = self.conn.execute(
+            "UPDATE notes SET mtime = ?, size = ? WHERE id = ?",
+            (mtime, size, note_id),
+        ).rowcount
+        if not updated:
+            return 0
+        last = self.conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM note_edits WHERE note_id = ?",
+            (note_id,),
+        ).fetchone()[0]
+        self.conn.executemany(
+            "INSERT INTO note_edits (note_id, seq, pos, remove, insert_text) VALUES (?, ?, ?, ?, ?)",
+            [(note_id, last + offset, pos, remove, text) for offset, (pos, remove, text) in enumerate(edits, 1)],
+        )
+        self._put_previews([(note_id, mtime, size, preview)])
+        return last + len(edits)
+
+    def journal_size(self, note_id: str) -> tuple[int, int]:
+        row = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length(insert_text)), 0) FROM note_edits WHERE note_id = ?",
+            (note_id,),
+        ).fetchone()
+        return row[0], row[1]
+
+    def compact(self, note_id: str) -> None:
+        with self.transaction():
+            row = self.conn.execute("SELECT mtime FROM notes WHERE id = ?", (note_id,)).fetchone()
+            if row is not None:
+                self._write_body(note_id, self.read(note_id), row[0])
+
+    def create(self, content: str = "") -> str:
+        note_id = new_note_id()
+        mtime = time.time()
+        terms, grams = search_terms(content), search_trigrams(content)
+        with self.transaction():
+            self._insert_front(note_id, content, mtime)
+            self._put_previews([(note_id, mtime, len(content), build_preview(content))])
+            self._index_note(note_id, terms, grams, mtime)
+            self._bump_rev(note_id)
+        return note_id
 
+    def append(self, note_id: str, text: str) -> bool:
+        # Appends go through the edit journal, so they merge with journaled edits from an open editor.
+        with self.transaction():
+            if not self.exists(note_id):
+                return False
+            content = self.read(note_id)
+            if content and not content.endswith("\n"):
+                text = "\n" + text
+            combined = content + text
+            self._append_edits(note_id, [[len(content), 0, text]], len(combined), build_preview(combined), time.time())
+            self._bump_rev(note_id)
+        return True
+
+    def delete(self, note_id: str) -> None:
+        self.delete_many([note_id])
+
+    def delete_many(self, note_ids: list[str]) -> None:
+        with self.transaction():
+            self._delete_rows(note_ids)
+            self._bump_rev()
+
+    def _delete_rows(self, note_ids: list[str]) -> None:
+        rows = [(note_id,) for note_id in note_ids]
+        self.conn.executemany("DELETE FROM notes WHERE id = ?", rows)
+        self.conn.executemany("DELETE FROM previews WHERE id = ?", rows)
+        for table in ("note_edits", "search_terms", "search_docs", "search_trigrams"):
+            self.conn.executemany(f"DELETE FROM {table} WHERE note_id = ?", rows)
+
+    def archive(self, note_ids: list[str], archived: bool = True) -> None:
+        with self.transaction():
+            self.conn.executemany(
+                "UPDATE notes SET archived = ? WHERE id = ?",
+                [(int(archived), note_id) for note_id in note_ids],
+            )
+            # To other windows an archived note looks deleted and a restored one looks new.
+            if archived:
+                self._bump_rev()
+            else:
+                for note_id in note_ids:
+                    self._bump_rev(note_id)
+
+    def merge(self, note_ids: list[str]) -> str:
+        # The first note keeps its id and position and receives the text of the others, in order.
+        target = note_ids[0]
+        with self.transaction():
+            parts = [self.read(note_id).rstrip("\n") for note_id in note_ids]
+            content = "\n\n".join(part for part in parts if part.strip())
+            self._write_body(target, content, time.time())
+            self._bump_rev(target)
+            self._delete_rows(note_ids[1:])
+            self._bump_rev()
+        return target
+
+    def save_state(self, note_ids, active_id: str) -> bool:
+        # New notes are stored in front and deletions keep relative order, so positions rarely need rewriting.
+        ids = list(note_ids)
+        reorder = self.order() != ids
+        reactivate = self.active_id() != active_id
+        if not reorder and not reactivate:
+            return False
+        with self.transaction():
+            if reorder:
+                self.conn.executemany(
+                    "UPDATE notes SET position = ? WHERE id = ?",
+                    [(position, note_id) for position, note_id in enumerate(ids)],
+                )
+            if reactivate:
+                self._set_meta("active_id", active_id)
+        return True
 
-def render_colored_svg_icon(source_svg: Path, color_hex: str, output_png: Path, size: int = 26) -> bool:
-    if not source_svg.exists():
-        return False
+    def migrate_legacy(self) -> None:
+        if self.get_meta("legacy_migrated") == "1":
+            return
 
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    source = read_file(source_svg)
-    if not source:
-        return False
+        # Import the one-file-per-note layout once; the old files are left in place as a backup.
+        entries: list[tuple[str, str, float]] = []
+        if NOTES_DIR.is_dir():
+            for path in NOTES_DIR.glob("*.txt"):
+                try:
+                    entries.append((path.stem, path.read_text(encoding="utf-8"), path.stat().st_mtime))
+                except Exception:
+                    continue
+        entries.sort(key=lambda entry: entry[2])
+
+        if not entries and LEGACY_NOTE_FILE.exists():
+            entries.append((new_note_id(), read_file(LEGACY_NOTE_FILE), time.time()))
+
+        ordered = [note_id for note_id, _content, _mtime in entries]
+        active_id = ordered[0] if ordered else ""
+        if STATE_FILE.exists():
+            try:
+                payload = json.loads(read_file(STATE_FILE))
+                known = set(ordered)
+                saved_ids = [str(nid) for nid in payload.get("note_ids", []) if str(nid) in known]
+                saved = set(saved_ids)
+                ordered = saved_ids + [nid for nid in ordered if nid not in saved]
+                saved_active = str(payload.get("active_id", ""))
+                if saved_active in known:
+                    active_id = saved_active
+            except Exception:
+                pass
+
+        positions = {note_id: position for position, note_id in enumerate(ordered)}
+        with self.transaction():
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO notes (id, body, position, mtime, size) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (note_id, content, positions[note_id], mtime, len(content))
+                    for note_id, content, mtime in entries
+                ],
+            )
+            if active_id:
+                self._set_meta("active_id", active_id)
+            self._set_meta("legacy_migrated", "1")
+
+
+class SaveQueue:
+    def __init__(self, path: Path = DB_FILE, durable: bool = SAVE_FSYNC) -> None:
+        self.path = path
+        self.durable = durable
+        self._cond = threading.Condition()
+        # Per note, an ordered list of ("full", content, rev) and ("edits", ops, size, preview, rev) entries,
+        # where rev is the stored revision the editor text was based on.
+        self._pending: dict[str, list[tuple]] = {}
+        self._in_flight: dict[str, list[tuple]] = {}
+        self._written: dict[str, bytes] = {}
+        self._revs: dict[str, int] = {}
+        self._conflicts: set[str] = set()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="sticky-note-writer", daemon=True)
+        self._thread.start()
+
+    def remember(self, note_id: str, content: str) -> None:
+        # Seed the hash of what is already stored so an unchanged note is never rewritten.
+        digest = content_hash(content)
+        with self._cond:
+            self._written[note_id] = digest
+
+    def submit(self, note_id: str, content: str, rev: int) -> None:
+        with self._cond:
+            self._pending[note_id] = [("full", content, rev)]
+            self._cond.notify_all()
+
+    def submit_edits(self, note_id: str, edits: list, size: int, preview: str, rev: int) -> None:
+        with self._cond:
+            self._enqueue_edits(note_id, ("edits", list(edits), size, preview, rev))
+            self._cond.notify_all()
+
+    def _enqueue_edits(self, note_id: str, entry: tuple) -> None:
+        queue = self._pending.setdefault(note_id, [])
+        if queue and queue[-1][0] == "edits":
+            _kind, edits, _size, _preview, rev = queue[-1]
+            queue[-1] = ("edits", edits + entry[1], entry[2], entry[3], rev)
+        else:
+            queue.append(entry)
+
+    def discard(self, note_id: str) -> None:
+        with self._cond:
+            self._pending.pop(note_id, None)
+            self._written.pop(note_id, None)
+            self._revs.pop(note_id, None)
+            self._conflicts.discard(note_id)
+
+    def conflicts(self) -> set[str]:
+        with self._cond:
+            return set(self._conflicts)
+
+    def written_rev(self, note_id: str) -> int:
+        with self._cond:
+            return self._revs.get(note_id, 0)
+
+    def preview_hint(self, note_id: str) -> str | None:
+        with self._cond:
+            queue = self._pending.get(note_id) or self._in_flight.get(note_id)
+            if not queue:
+                return None
+            last = queue[-1]
+        return build_preview(last[1]) if last[0] == "full" else last[3]
+
+    def unsaved_ids(self) -> set[str]:
+        with self._cond:
+            return set(self._pending) | set(self._in_flight)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        self.flush(timeout=10.0)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=2.0)
+
+    def _run(self) -> None:
+        store = NoteStore(self.path, durable=self.durable)
+        try:
+            while True:
+                with self._cond:
+                    while not self._pending and not self._closed:
+                        self._cond.wait()
+                    if not self._pending:
+                        return
+                    # Everything submitted since the last pass is coalesced into one transaction.
+                    self._in_flight = self._pending
+                    self._pending = {}
+                    batch = self._in_flight
+
+                written: dict[str, bytes | None] = {}
+                revs: dict[str, int] = {}
+                journaled: list[str] = []
+                conflicted: set[str] = set()
+                failed = False
+                try:
+                    mtime = time.time()
+                    with store.transaction():
+                        for note_id, queue in batch.items():
+                            # Edits and full text only apply to the version they were made against; the window
+                            # turns a refused save into a conflict copy.
+                            if store.changed_elsewhere(note_id, queue[0][-1]):
+                                conflicted.add(note_id)
+                                continue
+                            for entry in queue:
+                                if entry[0] == "full":
+                                    digest = content_hash(entry[1])
+                                    if digest == written.get(note_id, self._written.get(note_id)):
+                                        continue
+                                    store._write_body(note_id, entry[1], mtime)
+                                    written[note_id] = digest
+                                else:
+                                    store._append_edits(note_id, entry[1], entry[2], entry[3], mtime)
+                                    written[note_id] = None
+                                    journaled.append(note_id)
+                            if note_id in written:
+                                revs[note_id] = store._bump_rev(note_id)
+                except Exception as exc:
+                    failed = True
+                    print(f"sticky-note: save failed: {exc}", file=sys.stderr)
+
+                if not failed:
+                    for note_id in dict.fromkeys(journaled):
+                        self._compact_if_large(store, note_id)
+
+                with self._cond:
+                    if failed:
+                        # Put the batch back ahead of anything submitted while it was being written.
+                        for note_id, queue in batch.items():
+                            newer = self._pending.get(note_id, [])
+                            if newer and newer[0][0] == "full":
+                                continue
+                            self._pending[note_id] = list(queue)
+                            for entry in newer:
+                                self._enqueue_edits(note_id, entry)
+                    else:
+                        for note_id, digest in written.items():
+                            if digest is None:
+                                self._written.pop(note_id, None)
+                            else:
+                                self._written[note_id] = digest
+                        self._revs.update(revs)
+                        self._conflicts |= conflicted
+                    self._in_flight = {}
+                    self._cond.notify_all()
+                    if failed and not self._closed:
+                        self._cond.wait(SAVE_RETRY_S)
+        finally:
+            store.close()
 
+    def _compact_if_large(self, store: NoteStore, note_id: str) -> None:
+        try:
+            ops, chars = store.journal_size(note_id)
+            if ops > JOURNAL_COMPACT_OPS or chars > JOURNAL_COMPACT_CHARS:
+                store.compact(note_id)
+        except Exception as exc:
+            print(f"sticky-note: journal compaction failed: {exc}", file=sys.stderr)
+
+
+class NoteCache:
+    # Note bodies keyed by id and mtime, evicted least recently used first; shared with the prefetch thread.
+    def __init__(self, max_chars: int = NOTE_CACHE_CHARS) -> None:
+        self.max_chars = max_chars
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._chars = 0
+
+    def get(self, note_id: str, mtime: float) -> str | None:
+        with self._lock:
+            entry = self._entries.get(note_id)
+            if entry is None or entry[0] != mtime:
+                return None
+            self._entries.move_to_end(note_id)
+            return entry[1]
+
+    def put(self, note_id: str, mtime: float, content: str) -> None:
+        if len(content) > NOTE_CACHE_MAX_ENTRY:
+            return
+        with self._lock:
+            old = self._entries.pop(note_id, None)
+            if old is not None:
+                self._chars -= len(old[1])
+            self._entries[note_id] = (mtime, content)
+            self._chars += len(content)
+            while self._chars > self.max_chars and len(self._entries) > 1:
+                _note_id, (_mtime, evicted) = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+
+    def discard(self, note_id: str) -> None:
+        with self._lock:
+            old = self._entries.pop(note_id, None)
+            if old is not None:
+                self._chars -= len(old[1])
+
+
+class NotePrefetcher:
+    def __init__(self, cache: NoteCache, path: Path = DB_FILE) -> None:
+        self.cache = cache
+        self.path = path
+        self._cond = threading.Condition()
+        self._wanted: list[str] = []
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="sticky-note-prefetch", daemon=True)
+        self._thread.start()
+
+    def request(self, note_ids: list[str]) -> None:
+        # Only the latest request matters; notes that scrolled away are not worth reading anymore.
+        with self._cond:
+            self._wanted = list(note_ids)
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._wanted = []
+            self._cond.notify_all()
+        self._thread.join(timeout=2.0)
+
+    def _run(self) -> None:
+        store = NoteStore(self.path)
+        try:
+            while True:
+                with self._cond:
+                    while not self._wanted and not self._closed:
+                        self._cond.wait()
+                    if self._closed:
+                        return
+                    note_id = self._wanted.pop(0)
+                try:
+                    row = store.conn.execute("SELECT mtime, size FROM notes WHERE id = ?", (note_id,)).fetchone()
+                    if row is None or row[1] > NOTE_CACHE_MAX_ENTRY or self.cache.get(note_id, row[0]) is not None:
+                        continue
+                    self.cache.put(note_id, row[0], store.read(note_id))
+                except sqlite3.Error as exc:
+                    print(f"sticky-note: prefetch failed: {exc}", file=sys.stderr)
+        finally:
+            store.close()
+
+
+class StoreWatcher:
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+
+    def __init__(self, directory: Path, names: tuple[str, ...]) -> None:
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE
+        # The directory is watched rather than the files, since SQLite creates and removes the WAL.
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"cannot watch {directory}")
+        self.names = {os.fsencode(name) for name in names}
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def drain(self) -> bool:
+        relevant = False
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return relevant
+            offset = 0
+            while offset + 16 <= len(data):
+                _wd, _mask, _cookie, length = struct.unpack_from("iIII", data, offset)
+                name = data[offset + 16 : offset + 16 + length].rstrip(b"\0")
+                offset += 16 + length
+                relevant = relevant or name in self.names
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def open_store_watcher() -> StoreWatcher | None:
+    try:
+        return StoreWatcher(DB_FILE.parent, (DB_FILE.name, f"{DB_FILE.name}-wal"))
+    except (OSError, AttributeError):
+        return None
+
+
+def resolve_note_id(store: NoteStore, note_ids, prefix: str) -> str:
+    if store.exists(prefix):
+        return prefix
+    matches = [note_id for note_id in note_ids if note_id.startswith(prefix)]
+    if len(matches) != 1:
+        raise ValueError(f"{'ambiguous' if matches else 'unknown'} note id: {prefix}")
+    return matches[0]
+
+
+def cli_text(words: list[str]) -> str:
+    if words:
+        return " ".join(words) + "\n"
+    return "" if sys.stdin.isatty() else sys.stdin.read()
+
+
+def run_cli(args: argparse.Namespace) -> int:
+    # SQLite's write lock serializes these transactions against the GUI's writer thread.
+    store = NoteStore()
+    try:
+        # The window creates its own empty note on first launch; the CLI only touches notes it was asked about.
+        note_ids, active_id = bootstrap_state(store, create_empty=False)
+        if args.command == "list":
+            listed = store.archived() if args.archived else note_ids.ids()
+            previews = store.previews(listed)
+            for note_id in listed:
+                marker = "*" if note_id == active_id else " "
+                stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(store.mtime(note_id)))
+                title = previews.get(note_id, "").split("\n", 1)[0]
+                print(f"{marker} {note_id}\t{stamp}\t{title}")
+            return 0
+
+        if args.command == "create":
+            note_id = store.create(cli_text(args.text))
+            print(note_id)
+        elif args.command == "unarchive":
+            note_id = resolve_note_id(store, store.archived(), args.id)
+            store.archive([note_id], archived=False)
+        else:
+            note_id = resolve_note_id(store, note_ids, args.id) if args.id else active_id
+            if not note_id:
+                raise ValueError("no notes yet; use create")
+            if args.command == "read":
+                sys.stdout.write(store.read(note_id))
+                return 0
+            text = cli_text(args.text)
+            if not text:
+                return 0
+            store.append(note_id, text)
+            ops, chars = store.journal_size(note_id)
+            if ops > JOURNAL_COMPACT_OPS or chars > JOURNAL_COMPACT_CHARS:
+                store.compact(note_id)
+    except ValueError as exc:
+        print(f"sticky-note: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+
+    # A running window only needs to pick up the one note that changed.
+    send_command(f"reload {note_id}", timeout=0.5)
+    return 0
+
+
+def send_command(command: str, timeout: float = 1.0) -> str | None:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(str(CONTROL_SOCKET))
+            client.sendall(f"{command}\n".encode("utf-8"))
+            return client.recv(4096).decode("utf-8", "replace").strip()
+    except OSError:
+        return None
+
+
+def control_socket_state() -> str:
+    # A daemon whose Tk thread is busy still accepts connections into its backlog, so only a refused
+    # connection marks the socket as stale.
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.settimeout(1.0)
+            probe.connect(str(CONTROL_SOCKET))
+        return "live"
+    except TimeoutError:
+        return "live"
+    except ConnectionRefusedError:
+        return "stale"
+    except OSError:
+        return "missing"
+
+
+def open_control_socket(stale: bool = False) -> socket.socket | None:
+    # Without a socket the window still works; it just cannot be driven from outside.
+    try:
+        RUNTIME_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if stale:
+            # Left behind by a daemon that did not shut down cleanly.
+            CONTROL_SOCKET.unlink(missing_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            server.bind(str(CONTROL_SOCKET))
+            os.chmod(CONTROL_SOCKET, 0o600)
+            server.listen(8)
+            server.setblocking(False)
+        except OSError:
+            server.close()
+            raise
+        return server
+    except OSError as exc:
+        print(f"sticky-note: control socket unavailable: {exc}", file=sys.stderr)
+        return None
+
+
+def reconcile_search_index(path: Path = DB_FILE, prune: bool = True) -> None:
+    store = NoteStore(path)
+    try:
+        store.reconcile_search_index(prune)
+    except Exception as exc:
+        print(f"sticky-note: search index reconciliation failed: {exc}", file=sys.stderr)
+    finally:
+        store.close()
+
+
+def save_state(store: NoteStore, note_ids: NoteOrder, active_id: str) -> None:
+    store.save_state(note_ids, active_id)
+
+
+def bootstrap_state(store: NoteStore, create_empty: bool = True) -> tuple[NoteOrder, str]:
+    store.migrate_legacy()
+
+    note_ids = NoteOrder(store.order())
+    if not note_ids and create_empty:
+        note_ids.insert_front(store.create(""))
+
+    active_id = store.active_id()
+    if active_id not in note_ids:
+        active_id = note_ids.front()
+
+    save_state(store, note_ids, active_id)
+    return note_ids, active_id
+
+
+def recolor_svg(source: str, color_hex: str) -> str:
     # Keep stacked-note depth by using related shades instead of a single flat tint.
     palette = {
         "#FCD34D": _mix_color(color_hex, NOTE_BG, 0.42),  # back note fill
@@ -134,32 +1225,99 @@ def render_colored_svg_icon(source_svg: Path, color_hex: str, output_png: Path,
 
     for old, new in palette.items():
         source = source.replace(old, new).replace(old.lower(), new).replace(old.upper(), new)
+    return source
 
-    tmp_svg = output_png.with_suffix(".tmp.svg")
-    try:
-        write_file(tmp_svg, source)
-        subprocess.run(
-            [
-                "rsvg-convert",
-                "-w",
-                str(size),
-                "-h",
-                str(size),
-                str(tmp_svg),
-                "-o",
-                str(output_png),
-            ],
-            check=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-        return output_png.exists()
-    except Exception:
-        return False
-    finally:
+
+def icon_cache_path(svg: str, size: int, scale: int) -> Path:
+    # Keyed by what is rendered, so a changed source, colour, size or scale can never hit a stale file.
+    key = hashlib.blake2b(f"{ICON_RENDER_VERSION}\0{size}\0{scale}\0{svg}".encode("utf-8"), digest_size=12)
+    return CACHE_DIR / f"icon_{key.hexdigest()}.png"
+
+
+def render_svg_icons(source_svg: Path, colors: list[str], size: int, scale: int = 1) -> dict[str, Path]:
+    source = read_file(source_svg) if source_svg.exists() else ""
+    if not source:
+        return {}
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    pixels = size * scale
+    rendered: dict[str, Path] = {}
+    missing: list[tuple[str, str, Path]] = []
+    for color in colors:
+        svg = recolor_svg(source, color)
+        path = icon_cache_path(svg, size, scale)
         try:
-            tmp_svg.unlink()
+            # Refresh the age of hits so eviction drops the variants that are no longer used.
+            os.utime(path)
+            rendered[color] = path
+        except OSError:
+            missing.append((color, svg, path))
+
+    if cairosvg is not None:
+        for color, svg, path in missing:
+            tmp_png = path.with_suffix(".tmp.png")
+            try:
+                cairosvg.svg2png(bytestring=svg.encode("utf-8"), write_to=str(tmp_png), output_width=pixels, output_height=pixels)
+                os.replace(tmp_png, path)
+                rendered[color] = path
+            except Exception:
+                tmp_png.unlink(missing_ok=True)
+        return rendered
+
+    # Without an in-process renderer, start every rsvg-convert at once and wait for all of them.
+    jobs = []
+    for color, svg, path in missing:
+        tmp_png = path.with_suffix(".tmp.png")
+        try:
+            proc = subprocess.Popen(
+                ["rsvg-convert", "-w", str(pixels), "-h", str(pixels), "-o", str(tmp_png)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            break
+        try:
+            proc.stdin.write(svg.encode("utf-8"))
+            proc.stdin.close()
+        except OSError:
+            pass
+        jobs.append((color, path, tmp_png, proc))
+    for color, path, tmp_png, proc in jobs:
+        try:
+            if proc.wait(timeout=10) == 0 and tmp_png.exists():
+                os.replace(tmp_png, path)
+                rendered[color] = path
         except Exception:
+            proc.kill()
+        tmp_png.unlink(missing_ok=True)
+    return rendered
+
+
+def evict_icon_cache(max_bytes: int = ICON_CACHE_MAX_BYTES, max_age_s: float = ICON_CACHE_MAX_AGE_S) -> None:
+    try:
+        entries = []
+        for path in CACHE_DIR.glob("*.png"):
+            # Files from the old mtime-keyed naming scheme are never looked up again.
+            if path.name.startswith("notes_icon_"):
+                path.unlink(missing_ok=True)
+                continue
+            if path.name.startswith("icon_"):
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+    except OSError:
+        return
+
+    entries.sort()
+    now = time.time()
+    total = sum(size for _mtime, size, _path in entries)
+    for mtime, size, path in entries:
+        if now - mtime <= max_age_s and total <= max_bytes:
+            break
+        try:
+            path.unlink()
+            total -= size
+        except OSError:
             pass
 
 
@@ -206,24 +1364,156 @@ def _lerp_rect(start: tuple[float, float, float, float], end: tuple[float, float
     )
 
 
+# Vertex order of a rounded rectangle as indices into (x1, x1 + r, x2 - r, x2) and (y1, y1 + r, y2 - r, y2).
+_RRECT_X = (1, 1, 2, 2, 3, 3, 3, 3, 3, 3, 2, 2, 1, 1, 0, 0, 0, 0, 0, 0)
+_RRECT_Y = (0, 0, 0, 0, 0, 1, 1, 2, 2, 3, 3, 3, 3, 3, 3, 2, 2, 1, 1, 0)
+
+
+def _rounded_rect_points(x1: float, y1: float, x2: float, y2: float, radius: float) -> list[float]:
+    r = max(0.0, min(radius, (x2 - x1) / 2.0, (y2 - y1) / 2.0))
+    xs = (x1, x1 + r, x2 - r, x2)
+    ys = (y1, y1 + r, y2 - r, y2)
+    points: list[float] = []
+    for xi, yi in zip(_RRECT_X, _RRECT_Y):
+        points.append(xs[xi])
+        points.append(ys[yi])
+    return points
+
+
+def _card_radius(height: float) -> float:
+    return min(THUMB_RADIUS, int(height / 4))
+
+
+@lru_cache(maxsize=1)
+def _preview_font_file() -> str | None:
+    try:
+        result = subprocess.run(
+            ["fc-match", "-f", "%{file}", "Iosevka"],
+            check=True,
+            capture_output=True,
+            text=True,
+            timeout=2,
+        )
+    except Exception:
+        return None
+    return result.stdout.strip() or None
+
+
+def _wrap_to_width(text: str, font, max_width: float) -> list[str]:
+    lines: list[str] = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split(" "):
+            candidate = f"{line} {word}" if line else word
+            if not line or font.getlength(candidate) <= max_width:
+                line = candidate
+            else:
+                lines.append(line)
+                line = word
+        lines.append(line)
+    return lines
+
+
+def render_card_snapshots(text: str, width: int, height: int, px_per_pt: float) -> list:
+    # Draw the card once at full size, then downscale; returns [(width, height, PIL image), ...] largest first.
+    if Image is None or width < 2 or height < 2:
+        return []
+
+    font_px = max(6, round(11 * px_per_pt))
+    try:
+        font_file = _preview_font_file()
+        font = ImageFont.truetype(font_file, font_px) if font_file else ImageFont.load_default()
+    except Exception:
+        font = ImageFont.load_default()
+
+    image = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    draw.rounded_rectangle((0, 0, width - 1, height - 1), radius=_card_radius(height), fill=THUMB_BG)
+
+    line_h = font_px + max(2, font_px // 4)
+    y = 10
+    for line in _wrap_to_width(text, font, max(80, width - 20)):
+        if y + line_h > height:
+            break
+        draw.text((10, y), line, fill=NOTE_FG, font=font)
+        y += line_h
+
+    variants = []
+    for scale in ANIM_RASTER_SCALES:
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        scaled = image if scale == 1.0 else image.resize(size, Image.LANCZOS)
+        variants.append((size[0], size[1], scaled))
+    return variants
+
+
+def plan_card_geometry(starts: list, ends: list, eases: list[float]) -> tuple[list, list]:
+    # Returns per-frame, per-card rects and rounded-rect polygons, vectorized when NumPy is available.
+    if np is not None and starts:
+        start = np.asarray(starts, dtype=float)
+        delta = np.asarray(ends, dtype=float) - start
+        rects = start[None, :, :] + delta[None, :, :] * np.asarray(eases, dtype=float)[:, None, None]
+        x1, y1, x2, y2 = rects[..., 0], rects[..., 1], rects[..., 2], rects[..., 3]
+        radius = np.minimum(THUMB_RADIUS, np.trunc((y2 - y1) / 4))
+        r = np.maximum(0.0, np.minimum(radius, np.minimum((x2 - x1) / 2.0, (y2 - y1) / 2.0)))
+        xs = np.stack([x1, x1 + r, x2 - r, x2], axis=-1)[..., list(_RRECT_X)]
+        ys = np.stack([y1, y1 + r, y2 - r, y2], axis=-1)[..., list(_RRECT_Y)]
+        points = np.stack([xs, ys], axis=-1).reshape(len(eases), len(starts), len(_RRECT_X) * 2)
+        return rects.tolist(), points.tolist()
+
+    rects = [[_lerp_rect(s, e, t) for s, e in zip(starts, ends)] for t in eases]
+    points = [
+        [_rounded_rect_points(x1, y1, x2, y2, _card_radius(y2 - y1)) for x1, y1, x2, y2 in frame]
+        for frame in rects
+    ]
+    return rects, points
+
+
 class StickyNoteApp:
-    def __init__(self, root: tk.Tk) -> None:
+    def __init__(self, root: tk.Tk, control: socket.socket | None = None, resident: bool = False) -> None:
         self.root = root
+        self.control = control
+        self.resident = resident
         self.save_job: str | None = None
-        self.note_ids, self.current_note_id = bootstrap_state()
+        self.store = NoteStore()
+        self.saver = SaveQueue()
+        self.note_cache = NoteCache()
+        self.prefetcher = NotePrefetcher(self.note_cache)
+        self._journal: dict = {"note_id": "", "rev": 0, "ops": [], "size": 0, "ok": False, "suspended": 0}
+        self._loading: dict | None = None
+        # Parked editors of recently used notes, least recently used first; the active one is self.text.
+        self._editor_pool: OrderedDict[str, dict] = OrderedDict()
+        self._search_hits: list[str] | None = None
+        self._search_job: str | None = None
+        self.note_ids, self.current_note_id = bootstrap_state(self.store)
+        self._state_job: str | None = None
+        self._saved_state = (self.note_ids.ids(), self.current_note_id)
         self.in_gallery = False
         self.gallery_edit_mode = False
         self.animating = False
-        self.thumb_frames: dict[str, tk.Widget] = {}
+        self._animation: dict | None = None
+        self._anim_lod_bias = 0
+        self.thumb_items: dict[str, dict] = {}
+        self._thumb_slot_seq = 0
+        self._thumb_pool: list[dict] = []
+        self._gallery_order: list[str] = []
+        self._gallery_metrics: tuple[int, int, int, int, float] | None = None
+        self._gallery_previews: dict[str, str] = {}
+        self._gallery_window_pending = False
+        self._gallery_selection: set[str] = set()
+        self._selection_anchor: str | None = None
         self._gallery_refresh_pending = False
         self._gallery_refresh_force = False
         self._gallery_layout_key: tuple | None = None
         self._last_thumb_canvas_width = 0
         self._last_editor_text_rect: tuple[float, float, float, float] | None = None
         self._last_editor_window_size: tuple[int, int] | None = None
+        self._geometry: dict | None = None
+        self._resize_frame_job: str | None = None
+        self._resize_settle_job: str | None = None
 
-        self.notes_icon_default = self._load_notes_icon(NOTE_FG)
-        self.notes_icon_hover = self._load_notes_icon(ICON_HOVER)
+        # The editor sidebar is laid out in device pixels at this factor so HiDPI icons are not clipped.
+        self._ui_scale = self._icon_scale()
+        self.notes_icon_default, self.notes_icon_hover = self._load_notes_icons()
 
         root.title("Sticky Note")
         root.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")
@@ -247,73 +1537,267 @@ class StickyNoteApp:
         self._apply_editor_view(self.current_note_id)
 
         self.root.bind("<Escape>", self._on_escape)
+        # Bindings on the toplevel also see <Configure> from every child widget.
+        self.root.bind("<Configure>", self._invalidate_geometry, add="+")
+        self.root.bind("<Control-a>", self._on_select_all)
+        self.root.bind("<Delete>", self._on_delete_key)
         self.root.protocol("WM_DELETE_WINDOW", self._close)
 
-    def _load_notes_icon(self, color: str) -> tk.PhotoImage | None:
-        if not NOTES_ICON_SVG.exists():
-            return None
+        if self.control is not None:
+            self.root.tk.createfilehandler(self.control, tk.READABLE, self._on_control_ready)
 
-        png_path = CACHE_DIR / f"notes_icon_{ICON_RENDER_VERSION}_{color.lstrip('#')}.png"
-        try:
-            needs_render = (not png_path.exists()) or (png_path.stat().st_mtime < NOTES_ICON_SVG.stat().st_mtime)
-        except Exception:
-            needs_render = True
+        self._seen_rev = self.store.last_rev()
+        self._external_job: str | None = None
+        self._watch_job: str | None = None
+        self.watcher = open_store_watcher()
+        if self.watcher is not None:
+            self.root.tk.createfilehandler(self.watcher, tk.READABLE, self._on_store_event)
+        else:
+            self._watch_job = self.root.after(WATCH_POLL_MS, self._poll_store)
 
-        if needs_render and not render_colored_svg_icon(NOTES_ICON_SVG, color, png_path, size=EDITOR_ICON_SIZE):
-            return None
+        # Catch up on notes changed since the index was last updated without holding up the first paint.
+        self._reindex_job: str | None = None
+        self._reindex_thread = threading.Thread(target=reconcile_search_index, name="sticky-note-index", daemon=True)
+        self._reindex_thread.start()
+
+    def _on_control_ready(self, _fd, _mask) -> None:
+        while True:
+            try:
+                client, _addr = self.control.accept()
+            except OSError:
+                return
+            with client:
+                try:
+                    client.settimeout(0.5)
+                    request = b""
+                    while b"\n" not in request and len(request) < 4096:
+                        chunk = client.recv(4096)
+                        if not chunk:
+                            break
+                        request += chunk
+                    reply = self._handle_control(request.decode("utf-8", "replace").strip())
+                    client.sendall(f"{reply}\n".encode("utf-8"))
+                except OSError:
+                    continue
+
+    def _handle_control(self, request: str) -> str:
+        command, _, arg = request.partition(" ")
+        if command == "ping":
+            return "ok"
+        if command == "reload":
+            self._queue_external_check()
+            return "ok"
+        if command not in CONTROL_COMMANDS:
+            return f"error unknown command: {command}"
+        if command == "quit":
+            self.root.after_idle(self._shutdown)
+        elif command == "hide" or (command == "toggle" and self._window_visible()):
+            self._hide_window()
+        else:
+            self._show_window()
+            if command == "new":
+                self._create_new_note()
+        return "ok"
+
+    def _on_store_event(self, _fd, _mask) -> None:
+        if self.watcher.drain():
+            self._queue_external_check()
+
+    def _poll_store(self) -> None:
+        self._watch_job = self.root.after(WATCH_POLL_MS, self._poll_store)
+        self._check_external_changes()
+
+    def _queue_external_check(self) -> None:
+        if self._external_job is None:
+            self._external_job = self.root.after(WATCH_DEBOUNCE_MS, self._check_external_changes)
+
+    def _check_external_changes(self) -> None:
+        self._external_job = None
+        if self.animating:
+            self._queue_external_check()
+            return
+        rev, changed, removed = self.store.changes_since(self._seen_rev)
+        if rev == self._seen_rev:
+            return
+        self._seen_rev = rev
+
+        order_changed = False
+        if removed or any(nid not in self.note_ids for nid in changed):
+            stored = self.store.order()
+            present = set(stored)
+            # Notes created elsewhere are inserted at the front of the stored order.
+            added = [nid for nid in stored if nid not in self.note_ids]
+            gone = [nid for nid in self.note_ids if nid not in present]
+            for nid in reversed(added):
+                self.note_ids.insert_front(nid)
+            for nid in gone:
+                self.note_ids.remove(nid)
+            order_changed = bool(added or gone)
+        else:
+            present = self.note_ids
+
+        # The editor stays alive behind the gallery, so unsaved text there is resolved too.
+        open_id = self._journal["note_id"]
+        if open_id and open_id not in present:
+            if self.in_gallery and not self._editor_dirty():
+                self._release_editor()
+            else:
+                self._adopt_orphaned_note()
+                order_changed = True
+        elif open_id in changed and self.store.changed_elsewhere(open_id, self._journal["rev"]):
+            if self._editor_dirty():
+                self._save_conflict_copy(open_id)
+                order_changed = True
+            elif self.in_gallery:
+                self._release_editor()
+            else:
+                self._reload_open_note(open_id)
+
+        if not self.note_ids:
+            self.note_ids.insert_front(self._create_note_file(""))
+        if self.current_note_id not in self.note_ids:
+            self.current_note_id = self.note_ids.front()
+            self._persist_state()
+
+        if any(note_id in self._editor_pool for note_id in changed):
+            self.saver.flush()
+        conflicts = self.saver.conflicts()
+        for note_id in changed:
+            self._gallery_previews.pop(note_id, None)
+            entry = self._editor_pool.get(note_id)
+            if entry is not None and note_id in conflicts:
+                self._keep_parked_text(note_id, entry)
+                order_changed = True
+            self._evict_editor(note_id)
+        self._queue_reindex()
+        if self._search_hits is not None:
+            self._queue_search()
+        if self.in_gallery:
+            if order_changed:
+                self._queue_gallery_refresh()
+            else:
+                self._sync_gallery_window()
+
+    def _editor_dirty(self) -> bool:
+        return bool(
+            self.save_job is not None
+            or self._journal["ops"]
+            or (self._loading is not None and self._loading["save_after"])
+            or self._journal["note_id"] in self.saver.unsaved_ids()
+            or self._journal["note_id"] in self.saver.conflicts()
+        )
+
+    def _save_conflict_copy(self, note_id: str) -> None:
+        # Both sides changed: the editor keeps its text, and the other version becomes a note of its own.
+        if self.save_job is not None:
+            self.root.after_cancel(self.save_job)
+            self.save_job = None
+        self._finish_streaming_load()
+        # Anything still queued for this note is refused by the writer; wait for it so the flag can be cleared.
+        self.saver.flush()
+        self.saver.discard(note_id)
+        copy_id = self._create_note_file(self.store.read(note_id))
+        self.note_ids.insert_front(copy_id)
+        content = self.text.get("1.0", "end-1c")
+        rev = self.store.note_rev(note_id)
+        self.saver.submit(note_id, content, rev)
+        self._reset_journal(note_id, content, rev)
+        print(f"sticky-note: note {note_id} changed elsewhere; other version saved as {copy_id}", file=sys.stderr)
+
+    def _adopt_orphaned_note(self) -> None:
+        # The open note was deleted elsewhere; keep what is on screen as a new note.
+        if self.save_job is not None:
+            self.root.after_cancel(self.save_job)
+            self.save_job = None
+        self._finish_streaming_load()
+        content = self.text.get("1.0", "end-1c")
+        new_id = self._create_note_file(content)
+        self.note_ids.insert_front(new_id)
+        self.current_note_id = new_id
+        self._reset_journal(new_id, content, self.store.note_rev(new_id))
+        self.saver.remember(new_id, content)
+        self._persist_state()
+
+    def _reload_open_note(self, note_id: str) -> None:
+        insert = self.text.index("insert")
+        top = self.text.yview()[0]
+        self._load_note(note_id, force=True)
+        self.text.mark_set("insert", insert)
+        self.text.yview_moveto(top)
 
+    def _window_visible(self) -> bool:
+        return self.root.state() not in ("withdrawn", "iconic")
+
+    def _show_window(self) -> None:
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
+        if self.in_gallery:
+            self.thumb_canvas.focus_set()
+        else:
+            self.text.focus_set()
+
+    def _hide_window(self) -> None:
+        self._finish_animation()
+        if not self.in_gallery:
+            self._flush_if_pending()
+        self._flush_state()
+        self.saver.flush()
+        self.root.withdraw()
+
+    def _icon_scale(self) -> int:
+        # Tk reports pixels per point; 96 dpi (4/3) is the 1x baseline.
         try:
-            return tk.PhotoImage(file=str(png_path))
-        except Exception:
-            return None
+            ratio = float(self.root.tk.call("tk", "scaling")) * 72 / 96
+        except (tk.TclError, ValueError):
+            return 1
+        return min(ICON_SCALES, key=lambda scale: abs(scale - ratio))
+
+    def _load_notes_icons(self) -> tuple[tk.PhotoImage | None, tk.PhotoImage | None]:
+        paths = render_svg_icons(NOTES_ICON_SVG, [NOTE_FG, ICON_HOVER], EDITOR_ICON_SIZE, self._ui_scale)
+        threading.Thread(target=evict_icon_cache, name="sticky-note-icon-evict", daemon=True).start()
+
+        images: list[tk.PhotoImage | None] = []
+        for color in (NOTE_FG, ICON_HOVER):
+            try:
+                images.append(tk.PhotoImage(file=str(paths[color])))
+            except (KeyError, tk.TclError):
+                images.append(None)
+        return images[0], images[1]
 
     def _build_editor_ui(self) -> None:
         editor_body = tk.Frame(self.editor_frame, bg=NOTE_BG)
         editor_body.pack(fill="both", expand=True, padx=EDITOR_OUTER_PAD, pady=EDITOR_OUTER_PAD)
 
-        sidebar = tk.Frame(editor_body, bg=NOTE_BG, width=EDITOR_SIDEBAR_WIDTH)
+        scale = self._ui_scale
+        sidebar = tk.Frame(editor_body, bg=NOTE_BG, width=EDITOR_SIDEBAR_WIDTH * scale)
         sidebar.pack(side="right", fill="y")
         sidebar.pack_propagate(False)
 
         self.gallery_icon_button = self._notes_svg_button(sidebar, self._zoom_out_to_gallery)
-        self.gallery_icon_button.pack(side="top", anchor="ne", padx=(0, EDITOR_EDGE_PAD), pady=(EDITOR_EDGE_PAD, 0))
-
-        self.text = tk.Text(
-            editor_body,
-            wrap="word",
-            undo=True,
-            font=("Iosevka", 16),
-            padx=12,
-            pady=6,
-            bg=NOTE_BG,
-            fg=NOTE_FG,
-            insertbackground=NOTE_CURSOR,
-            insertwidth=2,
-            selectbackground=NOTE_SELECT_BG,
-            selectforeground=NOTE_SELECT_FG,
-            inactiveselectbackground=NOTE_SELECT_BG,
-            relief="flat",
-            bd=0,
-            highlightthickness=0,
+        self.gallery_icon_button.pack(
+            side="top", anchor="ne", padx=(0, EDITOR_EDGE_PAD * scale), pady=(EDITOR_EDGE_PAD * scale, 0)
         )
-        self.text.pack(side="left", fill="both", expand=True, padx=(0, EDITOR_SIDEBAR_GAP))
 
-        self.text.bind("<<Modified>>", self._on_modified)
+        self.editor_body = editor_body
+        self.text = self._create_editor_text()
+        self.text.pack(side="left", fill="both", expand=True, padx=(0, EDITOR_SIDEBAR_GAP * scale))
 
         self.plus_button = tk.Canvas(
             sidebar,
-            width=EDITOR_ICON_SIZE,
-            height=EDITOR_ICON_SIZE,
+            width=EDITOR_ICON_SIZE * scale,
+            height=EDITOR_ICON_SIZE * scale,
             bg=NOTE_BG,
             highlightthickness=0,
             bd=0,
             cursor="hand2",
             relief="flat",
         )
-        c = EDITOR_ICON_SIZE / 2
-        o = EDITOR_ICON_SIZE * 0.28
-        self.plus_button.create_line(c, c - o, c, c + o, fill=NOTE_CURSOR, width=EDITOR_ICON_STROKE, capstyle="round", tags=("plus",))
-        self.plus_button.create_line(c - o, c, c + o, c, fill=NOTE_CURSOR, width=EDITOR_ICON_STROKE, capstyle="round", tags=("plus",))
+        c = EDITOR_ICON_SIZE * scale / 2
+        o = EDITOR_ICON_SIZE * scale * 0.28
+        stroke = EDITOR_ICON_STROKE * scale
+        self.plus_button.create_line(c, c - o, c, c + o, fill=NOTE_CURSOR, width=stroke, capstyle="round", tags=("plus",))
+        self.plus_button.create_line(c - o, c, c + o, c, fill=NOTE_CURSOR, width=stroke, capstyle="round", tags=("plus",))
 
         def plus_enter(_event=None):
             for item in self.plus_button.find_withtag("plus"):
@@ -326,7 +1810,30 @@ class StickyNoteApp:
         self.plus_button.bind("<Enter>", plus_enter)
         self.plus_button.bind("<Leave>", plus_leave)
         self.plus_button.bind("<Button-1>", lambda _event: self._create_new_note())
-        self.plus_button.pack(side="bottom", anchor="se", padx=(0, EDITOR_EDGE_PAD), pady=(0, EDITOR_EDGE_PAD))
+        self.plus_button.pack(side="bottom", anchor="se", padx=(0, EDITOR_EDGE_PAD * scale), pady=(0, EDITOR_EDGE_PAD * scale))
+
+    def _create_editor_text(self) -> tk.Text:
+        text = tk.Text(
+            self.editor_body,
+            wrap="word",
+            undo=True,
+            font=("Iosevka", 16),
+            padx=12,
+            pady=6,
+            bg=NOTE_BG,
+            fg=NOTE_FG,
+            insertbackground=NOTE_CURSOR,
+            insertwidth=2,
+            selectbackground=NOTE_SELECT_BG,
+            selectforeground=NOTE_SELECT_FG,
+            inactiveselectbackground=NOTE_SELECT_BG,
+            relief="flat",
+            bd=0,
+            highlightthickness=0,
+        )
+        text.bind("<<Modified>>", self._on_modified)
+        self._install_edit_journal(text)
+        return text
 
     def _build_gallery_ui(self) -> None:
         top = tk.Frame(self.gallery_frame, bg=GALLERY_BG)
@@ -336,27 +1843,92 @@ class StickyNoteApp:
         self.gallery_cancel_button.pack(side="left")
         self.gallery_cancel_button.pack_forget()
 
+        self.selection_label = tk.Label(top, text="", bg=GALLERY_BG, fg=NOTE_FG, font=("Iosevka", 12))
+        self.gallery_action_buttons = [
+            self._icon_button(top, self._draw_trash_icon, lambda: self._bulk_action(self._delete_selected)),
+            self._icon_button(top, self._draw_archive_icon, lambda: self._bulk_action(self._archive_selected)),
+            self._icon_button(top, self._draw_merge_icon, lambda: self._bulk_action(self._merge_selected)),
+        ]
+
         self.gallery_edit_button = self._icon_button(top, self._draw_pencil_icon, self._enter_gallery_edit_mode)
         self.gallery_edit_button.pack(side="right")
 
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(
+            top,
+            textvariable=self.search_var,
+            font=("Iosevka", 12),
+            width=24,
+            bg="#23320d",
+            fg=NOTE_FG,
+            insertbackground=NOTE_CURSOR,
+            selectbackground=NOTE_SELECT_BG,
+            selectforeground=NOTE_SELECT_FG,
+            relief="flat",
+            bd=0,
+            highlightthickness=1,
+            highlightbackground="#23320d",
+            highlightcolor="#516821",
+        )
+        self.search_entry.pack(side="right", padx=(0, 10), ipady=4)
+        self.search_var.trace_add("write", lambda *_args: self._queue_search())
+        self.search_entry.bind("<Escape>", self._on_search_escape)
+
         body = tk.Frame(self.gallery_frame, bg=GALLERY_BG)
         body.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
         self.thumb_canvas = tk.Canvas(body, bg=GALLERY_BG, highlightthickness=0, bd=0)
         self.thumb_scroll = tk.Scrollbar(body, orient="vertical", command=self.thumb_canvas.yview)
-        self.thumb_canvas.configure(yscrollcommand=self.thumb_scroll.set)
+        self.thumb_canvas.configure(yscrollcommand=self._on_thumb_yscroll)
         self._theme_scrollbar(self.thumb_scroll)
 
         self.thumb_scroll.pack(side="right", fill="y")
         self.thumb_canvas.pack(side="left", fill="both", expand=True)
 
-        self.thumb_container = tk.Frame(self.thumb_canvas, bg=GALLERY_BG)
-        self.thumb_window = self.thumb_canvas.create_window((0, 0), window=self.thumb_container, anchor="nw")
-
-        self.thumb_container.bind("<Configure>", self._on_thumb_container_configure)
+        self.thumb_font = tkfont.Font(family="Iosevka", size=11)
+        self.thumb_canvas.tag_bind("thumb", "<Enter>", lambda _e: self.thumb_canvas.configure(cursor="hand2"))
+        self.thumb_canvas.tag_bind("thumb", "<Leave>", lambda _e: self.thumb_canvas.configure(cursor=""))
+        self.thumb_canvas.bind("<Button-1>", self._on_thumb_canvas_click)
         self.thumb_canvas.bind("<Configure>", self._on_thumb_canvas_configure)
         self.thumb_canvas.bind("<MouseWheel>", self._on_mousewheel)
 
+    def _queue_search(self) -> None:
+        if self._search_job is not None:
+            self.root.after_cancel(self._search_job)
+        self._search_job = self.root.after(SEARCH_DEBOUNCE_MS, self._run_search)
+
+    def _run_search(self) -> None:
+        self._search_job = None
+        query = self.search_var.get().strip()
+        # Recent saves reach the index through the background pass a moment later.
+        hits = self.store.search(query) if query else None
+        if hits != self._search_hits:
+            self._search_hits = hits
+            self.thumb_canvas.yview_moveto(0)
+            self._queue_gallery_refresh(force=True)
+
+    def _queue_reindex(self) -> None:
+        if self._reindex_job is None:
+            self._reindex_job = self.root.after(SEARCH_REINDEX_DELAY_MS, self._start_reindex)
+
+    def _start_reindex(self) -> None:
+        self._reindex_job = None
+        # Saves still on their way to the store would be missed, so wait until the writer is idle.
+        if self._reindex_thread.is_alive() or self.saver.unsaved_ids():
+            self._queue_reindex()
+            return
+        self._reindex_thread = threading.Thread(
+            target=reconcile_search_index, kwargs={"prune": False}, name="sticky-note-index", daemon=True
+        )
+        self._reindex_thread.start()
+
+    def _on_search_escape(self, _event=None):
+        if self.search_var.get():
+            self.search_var.set("")
+        else:
+            self.thumb_canvas.focus_set()
+        return "break"
+
     def _theme_scrollbar(self, scrollbar: tk.Scrollbar) -> None:
         themed_opts = {
             "background": "#516821",
@@ -415,22 +1987,48 @@ class StickyNoteApp:
 
         left = float(EDITOR_OUTER_PAD)
         top = float(EDITOR_OUTER_PAD)
-        right = float(root_w) - float(EDITOR_OUTER_PAD + EDITOR_SIDEBAR_WIDTH + EDITOR_SIDEBAR_GAP)
+        right = float(root_w) - float(EDITOR_OUTER_PAD + (EDITOR_SIDEBAR_WIDTH + EDITOR_SIDEBAR_GAP) * self._ui_scale)
         bottom = float(root_h) - float(EDITOR_OUTER_PAD)
         return (left, top, right, bottom)
 
-    def _on_thumb_container_configure(self, _event=None) -> None:
-        self.thumb_canvas.configure(scrollregion=self.thumb_canvas.bbox("all"))
+    def _on_thumb_yscroll(self, first, last) -> None:
+        self.thumb_scroll.set(first, last)
+        if self.in_gallery and len(self._gallery_order) > GALLERY_VIRTUAL_MIN_NOTES:
+            self._queue_gallery_window_sync()
+
+    def _queue_gallery_window_sync(self) -> None:
+        if self._gallery_window_pending:
+            return
+        self._gallery_window_pending = True
+        self.root.after_idle(self._run_gallery_window_sync)
+
+    def _run_gallery_window_sync(self) -> None:
+        self._gallery_window_pending = False
+        if self.in_gallery and not self.animating:
+            self._sync_gallery_window()
 
     def _on_thumb_canvas_configure(self, event=None) -> None:
-        if event is not None:
-            self.thumb_canvas.itemconfigure(self.thumb_window, width=event.width)
-            if event.width != self._last_thumb_canvas_width:
-                self._last_thumb_canvas_width = event.width
-                self._queue_gallery_refresh()
-                return
+        if event is not None and event.width != self._last_thumb_canvas_width:
+            self._last_thumb_canvas_width = event.width
+            # Interactive resizes deliver a burst of events; relayout at most once per frame while it lasts.
+            if self._resize_frame_job is None:
+                self._resize_frame_job = self.root.after(RESIZE_FRAME_MS, self._resize_frame)
+            if self._resize_settle_job is not None:
+                self.root.after_cancel(self._resize_settle_job)
+            self._resize_settle_job = self.root.after(RESIZE_SETTLE_MS, self._finish_resize)
+            return
+        # Only the height changed, which can only reveal or hide rows.
         if self.in_gallery and not self.animating:
-            self._queue_gallery_refresh()
+            self._queue_gallery_window_sync()
+
+    def _resize_frame(self) -> None:
+        self._resize_frame_job = None
+        if self.in_gallery and not self.animating:
+            self._refresh_gallery()
+
+    def _finish_resize(self) -> None:
+        self._resize_settle_job = None
+        self._queue_gallery_refresh(force=True)
 
     def _on_mousewheel(self, event) -> None:
         if self.in_gallery:
@@ -509,20 +2107,60 @@ class StickyNoteApp:
         canvas.create_line(21, 9, 25, 13, fill=color, width=2, tags=("icon",))
         canvas.create_line(8, 25, 14, 24, fill=color, width=2, tags=("icon",))
 
+    def _draw_trash_icon(self, canvas: tk.Canvas, color: str) -> None:
+        canvas.delete("all")
+        canvas.create_line(8, 10, 26, 10, fill=color, width=2, capstyle="round", tags=("icon",))
+        canvas.create_line(14, 7, 20, 7, fill=color, width=2, capstyle="round", tags=("icon",))
+        canvas.create_polygon(10, 10, 12, 27, 22, 27, 24, 10, outline=color, fill="", width=2, tags=("icon",))
+        canvas.create_line(15, 14, 15, 23, fill=color, width=2, tags=("icon",))
+        canvas.create_line(19, 14, 19, 23, fill=color, width=2, tags=("icon",))
+
+    def _draw_archive_icon(self, canvas: tk.Canvas, color: str) -> None:
+        canvas.delete("all")
+        canvas.create_rectangle(7, 8, 27, 13, outline=color, width=2, tags=("icon",))
+        canvas.create_rectangle(9, 13, 25, 26, outline=color, width=2, tags=("icon",))
+        canvas.create_line(14, 18, 20, 18, fill=color, width=2, capstyle="round", tags=("icon",))
+
+    def _draw_merge_icon(self, canvas: tk.Canvas, color: str) -> None:
+        canvas.delete("all")
+        canvas.create_line(9, 7, 17, 16, 17, 27, fill=color, width=2, capstyle="round", tags=("icon",))
+        canvas.create_line(25, 7, 17, 16, fill=color, width=2, capstyle="round", tags=("icon",))
+        canvas.create_line(13, 23, 17, 27, 21, 23, fill=color, width=2, capstyle="round", tags=("icon",))
+
     def _draw_chevron_left(self, canvas: tk.Canvas, color: str) -> None:
         canvas.delete("all")
         canvas.create_line(21, 8, 13, 17, fill=color, width=3, capstyle="round", tags=("icon",))
         canvas.create_line(13, 17, 21, 26, fill=color, width=3, capstyle="round", tags=("icon",))
 
+    def _geometry_snapshot(self) -> dict:
+        # Layout is flushed once per snapshot; widget rects are then read lazily and remembered until
+        # the next <Configure> or view switch invalidates them.
+        snapshot = self._geometry
+        if snapshot is None:
+            self.root.update_idletasks()
+            snapshot = {
+                "origin": (self.root.winfo_rootx(), self.root.winfo_rooty()),
+                "size": (self.root.winfo_width(), self.root.winfo_height()),
+                "rects": {},
+            }
+            self._geometry = snapshot
+        return snapshot
+
+    def _invalidate_geometry(self, _event=None) -> None:
+        self._geometry = None
+
     def _widget_rect(self, widget: tk.Widget) -> tuple[float, float, float, float]:
-        self.root.update_idletasks()
-        rx = self.root.winfo_rootx()
-        ry = self.root.winfo_rooty()
-        x1 = widget.winfo_rootx() - rx
-        y1 = widget.winfo_rooty() - ry
-        x2 = x1 + widget.winfo_width()
-        y2 = y1 + widget.winfo_height()
-        return float(x1), float(y1), float(x2), float(y2)
+        snapshot = self._geometry_snapshot()
+        rect = snapshot["rects"].get(str(widget))
+        if rect is None:
+            rx, ry = snapshot["origin"]
+            x1 = widget.winfo_rootx() - rx
+            y1 = widget.winfo_rooty() - ry
+            x2 = x1 + widget.winfo_width()
+            y2 = y1 + widget.winfo_height()
+            rect = (float(x1), float(y1), float(x2), float(y2))
+            snapshot["rects"][str(widget)] = rect
+        return rect
 
     def _scaled_rect(self, rect: tuple[float, float, float, float], scale: float) -> tuple[float, float, float, float]:
         x1, y1, x2, y2 = rect
@@ -547,13 +2185,14 @@ class StickyNoteApp:
         show_text: bool,
     ) -> dict[str, int]:
         x1, y1, x2, y2 = rect
+        preview = self._thumbnail_text(note_id)
         rect_id = self._rounded_rect(
             overlay,
             x1,
             y1,
             x2,
             y2,
-            radius=min(THUMB_RADIUS, int((y2 - y1) / 4)),
+            radius=_card_radius(y2 - y1),
             fill=THUMB_BG,
             outline="",
             width=0,
@@ -561,7 +2200,7 @@ class StickyNoteApp:
         text_id = overlay.create_text(
             x1 + 10,
             y1 + 10,
-            text=self._thumbnail_text(note_id),
+            text=preview,
             fill=NOTE_FG,
             anchor="nw",
             justify="left",
@@ -570,57 +2209,7 @@ class StickyNoteApp:
         )
         if not show_text:
             overlay.itemconfigure(text_id, state="hidden")
-        return {"rect": rect_id, "text": text_id, "show_text": show_text}
-
-    def _place_overlay_card(
-        self,
-        overlay: tk.Canvas,
-        card: dict[str, int],
-        rect: tuple[float, float, float, float],
-    ) -> None:
-        x1, y1, x2, y2 = rect
-        points = self._rounded_rect_points(
-            x1,
-            y1,
-            x2,
-            y2,
-            min(THUMB_RADIUS, int((y2 - y1) / 4)),
-        )
-        overlay.coords(card["rect"], *points)
-        overlay.coords(card["text"], x1 + 10, y1 + 10)
-        overlay.itemconfigure(card["text"], width=max(80, int((x2 - x1) - 20)))
-
-    def _rounded_rect_points(
-        self,
-        x1: float,
-        y1: float,
-        x2: float,
-        y2: float,
-        radius: float,
-    ) -> list[float]:
-        r = max(0.0, min(radius, (x2 - x1) / 2.0, (y2 - y1) / 2.0))
-        return [
-            x1 + r, y1,
-            x1 + r, y1,
-            x2 - r, y1,
-            x2 - r, y1,
-            x2, y1,
-            x2, y1 + r,
-            x2, y1 + r,
-            x2, y2 - r,
-            x2, y2 - r,
-            x2, y2,
-            x2 - r, y2,
-            x2 - r, y2,
-            x1 + r, y2,
-            x1 + r, y2,
-            x1, y2,
-            x1, y2 - r,
-            x1, y2 - r,
-            x1, y1 + r,
-            x1, y1 + r,
-            x1, y1,
-        ]
+        return {"rect": rect_id, "text": text_id, "show_text": show_text, "preview": preview}
 
     def _rounded_rect(
         self,
@@ -634,7 +2223,7 @@ class StickyNoteApp:
         outline: str,
         width: int,
     ) -> int:
-        points = self._rounded_rect_points(x1, y1, x2, y2, radius)
+        points = _rounded_rect_points(x1, y1, x2, y2, radius)
         return canvas.create_polygon(
             points,
             smooth=True,
@@ -646,18 +2235,40 @@ class StickyNoteApp:
 
     def _animation_note_ids(self, focus_note_id: str) -> list[str]:
         if focus_note_id not in self.note_ids:
-            return self.note_ids[:ANIM_MAX_NOTES]
-        ordered = [focus_note_id] + [nid for nid in self.note_ids if nid != focus_note_id]
-        return ordered[:ANIM_MAX_NOTES]
+            return self.note_ids.first(ANIM_MAX_NOTES)
+        others = [nid for nid in self.note_ids.first(ANIM_MAX_NOTES) if nid != focus_note_id]
+        return [focus_note_id] + others[: ANIM_MAX_NOTES - 1]
 
     def _gallery_rects(self) -> dict[str, tuple[float, float, float, float]]:
         rects: dict[str, tuple[float, float, float, float]] = {}
-        for note_id, frame in self.thumb_frames.items():
-            if frame.winfo_exists():
-                rects[note_id] = self._widget_rect(frame)
+        if not self.thumb_items:
+            return rects
+        origin = self._widget_rect(self.thumb_canvas)
+        scroll = (self.thumb_canvas.canvasx(0), self.thumb_canvas.canvasy(0))
+        for note_id in self.thumb_items:
+            rects[note_id] = self._thumb_rect(note_id, origin, scroll)
         return rects
 
-    def _run_overlay_animation(
+    def _thumb_rect(
+        self,
+        note_id: str,
+        origin: tuple[float, float, float, float] | None = None,
+        scroll: tuple[float, float] | None = None,
+    ) -> tuple[float, float, float, float] | None:
+        items = self.thumb_items.get(note_id)
+        if items is None or items["cell"] is None or items["size"] is None:
+            return None
+        if origin is None:
+            origin = self._widget_rect(self.thumb_canvas)
+        if scroll is None:
+            scroll = (self.thumb_canvas.canvasx(0), self.thumb_canvas.canvasy(0))
+        thumb_w, thumb_h = items["size"]
+        cx, top = items["cell"]
+        x1 = origin[0] + cx - thumb_w / 2.0 - scroll[0]
+        y1 = origin[1] + top - scroll[1]
+        return x1, y1, x1 + thumb_w, y1 + thumb_h
+
+    def _start_overlay_animation(
         self,
         overlay: tk.Canvas,
         cards: dict[str, dict[str, int]],
@@ -667,61 +2278,234 @@ class StickyNoteApp:
         bg_to: str,
         focus_note_id: str,
         direction: str,
+        on_finish,
     ) -> None:
-        steps = max(12, int(ANIM_DURATION_MS / ANIM_FRAME_MS))
-        note_ids = list(cards.keys())
-
-        for step in range(steps + 1):
-            t = step / steps
-            e = _ease_in_out_cubic(t)
-            overlay.configure(bg=_mix_color(bg_from, bg_to, e))
+        self._animation = {
+            "overlay": overlay,
+            "cards": cards,
+            "start_rects": start_rects,
+            "end_rects": end_rects,
+            "bg_from": bg_from,
+            "bg_to": bg_to,
+            "focus": focus_note_id,
+            "direction": direction,
+            "on_finish": on_finish,
+            "job": None,
+            "frame": -1,
+            "last_tick": None,
+            "frame_ms": None,
+            "slow": False,
+        }
+        anim = self._animation
+        anim["plan"] = self._plan_overlay_keyframes(anim)
+        anim["applied"] = [{} for _ in anim["plan"]["note_ids"]]
+        anim["applied_bg"] = None
+        if ANIM_RASTER and Image is not None:
+            self._prepare_raster_cards(anim)
+        if focus_note_id in cards:
+            overlay.tag_raise(cards[focus_note_id]["rect"])
+            overlay.tag_raise(cards[focus_note_id]["text"])
+
+        # Any input skips straight to the final keyframe instead of waiting for the transition.
+        overlay.bind("<Button>", lambda _e: self._finish_animation())
+        self.root.bind("<KeyPress>", lambda _e: self._finish_animation())
+        anim["started"] = time.monotonic()
+        self._animation_tick()
+
+    def _animation_tick(self) -> None:
+        anim = self._animation
+        if anim is None:
+            return
+        anim["job"] = None
+        frame_start = time.monotonic()
+        progress = min(1.0, (frame_start - anim["started"]) * 1000.0 / ANIM_DURATION_MS)
+        if progress >= 1.0:
+            self._finish_animation()
+            return
 
-            for note_id in note_ids:
-                start = start_rects[note_id]
-                end = end_rects.get(note_id, start)
-                rect = _lerp_rect(start, end, e)
-                card = cards[note_id]
-                self._place_overlay_card(overlay, card, rect)
+        # Step down a detail tier whenever frames consistently arrive later than the budget.
+        if anim["last_tick"] is not None:
+            interval = (frame_start - anim["last_tick"]) * 1000.0
+            smoothed = interval if anim["frame_ms"] is None else anim["frame_ms"] * 0.6 + interval * 0.4
+            anim["frame_ms"] = smoothed
+            if smoothed > ANIM_FRAME_MS * 1.5 and self._anim_lod_bias < ANIM_LOD_MAX_BIAS:
+                self._anim_lod_bias += 1
+                anim["frame_ms"] = None
+                anim["slow"] = True
+        anim["last_tick"] = frame_start
+
+        frames = anim["plan"]["frames"]
+        self._apply_keyframe(anim, min(frames, int(round(progress * frames))))
+
+        # Progress follows the wall clock, so an overrun frame is dropped rather than stretching the transition.
+        spent_ms = (time.monotonic() - frame_start) * 1000.0
+        anim["job"] = self.root.after(max(1, int(ANIM_FRAME_MS - spent_ms)), self._animation_tick)
+
+    def _finish_animation(self) -> None:
+        anim = self._animation
+        if anim is None:
+            return
+        self._animation = None
+        if anim["job"] is not None:
+            self.root.after_cancel(anim["job"])
+        self.root.unbind("<KeyPress>")
+        if not anim["slow"] and self._anim_lod_bias > 0:
+            self._anim_lod_bias -= 1
+        try:
+            self._apply_keyframe(anim, anim["plan"]["frames"])
+            anim["on_finish"]()
+        finally:
+            anim["overlay"].destroy()
+            self.animating = False
+        if self._gallery_refresh_force:
+            self._queue_gallery_refresh()
 
-                width = rect[2] - rect[0]
+    def _plan_overlay_keyframes(self, anim: dict) -> dict:
+        frames = max(12, int(ANIM_DURATION_MS / ANIM_FRAME_MS))
+        eases = [_ease_in_out_cubic(step / frames) for step in range(frames + 1)]
+        note_ids = list(anim["cards"].keys())
+        starts = [anim["start_rects"][nid] for nid in note_ids]
+        ends = [anim["end_rects"].get(nid, anim["start_rects"][nid]) for nid in note_ids]
+        rects, points = plan_card_geometry(starts, ends, eases)
+
+        bg_to = anim["bg_to"]
+        focus_note_id = anim["focus"]
+        direction = anim["direction"]
+        dissolve_fill = [_mix_color(THUMB_BG, bg_to, min(1.0, max(0.0, (e - 0.12) / 0.88))) for e in eases]
+
+        fills: list[list[str]] = []
+        text_states: list[list[str]] = []
+        shapes: list[list[int]] = []
+        for step, e in enumerate(eases):
+            frame_fills: list[str] = []
+            frame_states: list[str] = []
+            frame_shapes: list[int] = []
+            for index, note_id in enumerate(note_ids):
+                x1, _y1, x2, _y2 = rects[step][index]
+                width = x2 - x1
+                frame_shapes.append(0 if width >= ANIM_LOD_SMOOTH_MIN else 1 if width >= ANIM_LOD_POLYGON_MIN else 2)
                 is_focus = note_id == focus_note_id
+                dissolving = direction == "in" and not is_focus
+                frame_fills.append(dissolve_fill[step] if dissolving else THUMB_BG)
+                visible = (
+                    anim["cards"][note_id].get("show_text", True)
+                    and not dissolving
+                    and width >= ANIM_LOD_TEXT_MIN
+                )
+                frame_states.append("normal" if visible else "hidden")
+            fills.append(frame_fills)
+            text_states.append(frame_states)
+            shapes.append(frame_shapes)
+
+        return {
+            "frames": frames,
+            "note_ids": note_ids,
+            "bg": [_mix_color(anim["bg_from"], bg_to, e) for e in eases],
+            "rects": rects,
+            "points": points,
+            "fills": fills,
+            "text_states": text_states,
+            "shapes": shapes,
+        }
 
-                if direction == "out":
-                    text_color = NOTE_FG if is_focus else NOTE_FG
-                    overlay.itemconfigure(card["rect"], fill=THUMB_BG)
-                    overlay.itemconfigure(card["rect"], outline="")
-                    if is_focus:
-                        overlay.itemconfigure(card["text"], fill=text_color)
-                else:
-                    if is_focus:
-                        overlay.itemconfigure(card["rect"], fill=THUMB_BG)
-                        overlay.itemconfigure(card["rect"], outline="")
-                        overlay.itemconfigure(card["text"], fill=NOTE_FG)
-                    else:
-                        dissolve = min(1.0, max(0.0, (e - 0.12) / 0.88))
-                        overlay.itemconfigure(card["rect"], fill=_mix_color(THUMB_BG, bg_to, dissolve))
-                        overlay.itemconfigure(card["rect"], outline="")
-                        overlay.itemconfigure(card["text"], state="hidden")
-
-                if not card.get("show_text", True):
-                    overlay.itemconfigure(card["text"], state="hidden")
-                elif width < 150:
-                    overlay.itemconfigure(card["text"], state="hidden")
-                elif direction == "in" and not is_focus and e > 0.75:
-                    overlay.itemconfigure(card["text"], state="hidden")
-                else:
-                    overlay.itemconfigure(card["text"], state="normal")
+    def _prepare_raster_cards(self, anim: dict) -> None:
+        plan = anim["plan"]
+        overlay = anim["overlay"]
+        px_per_pt = float(self.root.tk.call("tk", "scaling"))
+        raster: dict[int, dict] = {}
+
+        for index, note_id in enumerate(plan["note_ids"]):
+            card = anim["cards"][note_id]
+            if not card.get("show_text", True):
+                continue
+            # Snapshot at the largest size the card reaches so downscaled variants stay sharp.
+            widest = max((frame[index] for frame in plan["rects"]), key=lambda r: r[2] - r[0])
+            width = int(widest[2] - widest[0])
+            height = int(widest[3] - widest[1])
+            variants = render_card_snapshots(card["preview"], width, height, px_per_pt)
+            if not variants:
+                continue
 
-            if focus_note_id in cards:
-                overlay.tag_raise(cards[focus_note_id]["rect"])
-                overlay.tag_raise(cards[focus_note_id]["text"])
+            images = [ImageTk.PhotoImage(image, master=overlay) for _w, _h, image in variants]
+            widths = [w for w, _h, _image in variants]
+            steps = []
+            for frame in plan["rects"]:
+                x1, y1, x2, y2 = frame[index]
+                variant = min(range(len(widths)), key=lambda i: abs(widths[i] - (x2 - x1)))
+                steps.append((variant, ((x1 + x2) / 2.0, (y1 + y2) / 2.0)))
 
-            self.root.update_idletasks()
-            if step < steps:
-                self.root.after(ANIM_FRAME_MS)
+            overlay.itemconfigure(card["rect"], state="hidden")
+            overlay.itemconfigure(card["text"], state="hidden")
+            item = overlay.create_image(*steps[0][1], image=images[steps[0][0]], anchor="center")
+            raster[index] = {"images": images, "steps": steps, "item": item}
+
+        plan["raster"] = raster
 
-        # Let the final keyframe settle before removing the overlay.
-        self.root.update_idletasks()
+    def _apply_keyframe(self, anim: dict, step: int) -> None:
+        if step == anim["frame"]:
+            return
+        anim["frame"] = step
+        plan = anim["plan"]
+        overlay = anim["overlay"]
+
+        bg = plan["bg"][step]
+        if bg != anim["applied_bg"]:
+            overlay.configure(bg=bg)
+            anim["applied_bg"] = bg
+
+        # Only touch the canvas for values that differ from what the previous keyframe already set.
+        raster = plan.get("raster", {})
+        for index, note_id in enumerate(plan["note_ids"]):
+            card = anim["cards"][note_id]
+            applied = anim["applied"][index]
+            x1, y1, x2, y2 = plan["rects"][step][index]
+
+            snapshot = raster.get(index)
+            if snapshot is not None:
+                if step < plan["frames"]:
+                    variant, center = snapshot["steps"][step]
+                    if variant != applied.get("variant"):
+                        overlay.itemconfigure(snapshot["item"], image=snapshot["images"][variant])
+                        applied["variant"] = variant
+                    overlay.coords(snapshot["item"], *center)
+                    continue
+                # Final keyframe: hand over to the live polygon and text so wrapping matches the real layout.
+                overlay.delete(snapshot["item"])
+                overlay.itemconfigure(card["rect"], state="normal")
+                raster.pop(index)
+
+            # Shape tiers: 0 smoothed rounded polygon, 1 unsmoothed polygon, 2 plain rectangle.
+            bias = self._anim_lod_bias if note_id != anim["focus"] else max(0, self._anim_lod_bias - 1)
+            shape = min(2, plan["shapes"][step][index] + bias)
+            points = [x1, y1, x2, y1, x2, y2, x1, y2] if shape == 2 else plan["points"][step][index]
+            if points != applied.get("points"):
+                overlay.coords(card["rect"], *points)
+                applied["points"] = points
+            smooth = shape == 0
+            if smooth != applied.get("smooth"):
+                overlay.itemconfigure(card["rect"], smooth=smooth)
+                applied["smooth"] = smooth
+
+            fill = plan["fills"][step][index]
+            if fill != applied.get("fill"):
+                overlay.itemconfigure(card["rect"], fill=fill)
+                applied["fill"] = fill
+
+            state = plan["text_states"][step][index]
+            if state != applied.get("text_state"):
+                overlay.itemconfigure(card["text"], state=state)
+                applied["text_state"] = state
+            if state == "hidden":
+                continue
+
+            text_xy = (x1 + 10, y1 + 10)
+            if text_xy != applied.get("text_xy"):
+                overlay.coords(card["text"], *text_xy)
+                applied["text_xy"] = text_xy
+            text_width = max(80, int((x2 - x1) - 20))
+            if text_width != applied.get("text_width"):
+                overlay.itemconfigure(card["text"], width=text_width)
+                applied["text_width"] = text_width
 
     def _animate_editor_to_gallery(self) -> None:
         if self.animating:
@@ -730,13 +2514,11 @@ class StickyNoteApp:
         self.animating = True
         overlay = None
         try:
-            self.root.update_idletasks()
             start_focus_rect = self._widget_rect(self.text)
             collapsed = self._scaled_rect(start_focus_rect, 0.22)
             note_ids = self._animation_note_ids(self.current_note_id)
 
             overlay = self._create_overlay(NOTE_BG)
-            self.root.update_idletasks()
             cards: dict[str, dict[str, int]] = {}
             start_rects: dict[str, tuple[float, float, float, float]] = {}
 
@@ -752,30 +2534,29 @@ class StickyNoteApp:
                 )
 
             self._apply_gallery_view(sync_refresh=True)
-            self.root.update_idletasks()
             target_rects = self._gallery_rects()
 
             for note_id in note_ids:
                 if note_id not in target_rects:
                     target_rects[note_id] = collapsed
-
-            self._run_overlay_animation(
-                overlay,
-                cards,
-                start_rects,
-                target_rects,
-                NOTE_BG,
-                GALLERY_BG,
-                self.current_note_id,
-                "out",
-            )
-            # Keep the underlying gallery in sync with the final animated frame.
-            self._refresh_gallery(force=True)
-            self.root.update_idletasks()
-        finally:
+        except BaseException:
             if overlay is not None:
                 overlay.destroy()
             self.animating = False
+            raise
+
+        # Keep the underlying gallery in sync with the final animated frame.
+        self._start_overlay_animation(
+            overlay,
+            cards,
+            start_rects,
+            target_rects,
+            NOTE_BG,
+            GALLERY_BG,
+            self.current_note_id,
+            "out",
+            on_finish=lambda: self._refresh_gallery(force=True),
+        )
 
     def _animate_gallery_to_editor(
         self,
@@ -788,7 +2569,6 @@ class StickyNoteApp:
         self.animating = True
         overlay = None
         try:
-            self.root.update_idletasks()
             note_ids = self._animation_note_ids(note_id)
             source_rects = self._gallery_rects()
             if source_rect is not None:
@@ -799,7 +2579,6 @@ class StickyNoteApp:
                 source_rects[note_id] = self._scaled_rect(canvas_rect, 0.4)
 
             overlay = self._create_overlay(GALLERY_BG)
-            self.root.update_idletasks()
             cards: dict[str, dict[str, int]] = {}
             start_rects: dict[str, tuple[float, float, float, float]] = {}
 
@@ -820,37 +2599,319 @@ class StickyNoteApp:
                 existing_id: (target_focus if existing_id == note_id else collapsed)
                 for existing_id in note_ids
             }
-
-            self._run_overlay_animation(
-                overlay,
-                cards,
-                start_rects,
-                end_rects,
-                GALLERY_BG,
-                NOTE_BG,
-                note_id,
-                "in",
-            )
-            # Switch the real widgets while the overlay still hides layout changes.
-            self._apply_editor_view(note_id)
-            self.root.update_idletasks()
-        finally:
+        except BaseException:
             if overlay is not None:
                 overlay.destroy()
             self.animating = False
+            raise
+
+        # Switch the real widgets while the overlay still hides layout changes.
+        self._start_overlay_animation(
+            overlay,
+            cards,
+            start_rects,
+            end_rects,
+            GALLERY_BG,
+            NOTE_BG,
+            note_id,
+            "in",
+            on_finish=lambda: self._apply_editor_view(note_id),
+        )
 
     def _create_note_file(self, content: str = "") -> str:
-        note_id = new_note_id()
-        write_file(note_file(note_id), content)
-        return note_id
+        return self.store.create(content)
 
-    def _load_note(self, note_id: str) -> None:
-        self.text.delete("1.0", "end")
-        self.text.insert("1.0", read_file(note_file(note_id)))
+    def _load_note(self, note_id: str, force: bool = False) -> None:
+        self._flush_if_pending()
+        # Back to the note that is already in the live editor: keep its undo history, cursor and layout.
+        if not force and self._journal["note_id"] == note_id:
+            if self._editor_current(note_id, self._journal["rev"]):
+                return
+            if note_id in self.saver.conflicts():
+                self._save_conflict_copy(note_id)
+                return
+        partial = self._loading is not None
+        self._cancel_streaming_load()
+
+        previous = self._journal["note_id"]
+        if previous != note_id:
+            # A half-streamed editor is not worth keeping; it is simply reused for the new note.
+            keep = bool(previous) and not partial
+            entry = self._editor_pool.pop(note_id, None)
+            if keep:
+                self._park_editor()
+            if entry is not None and not self._editor_current(note_id, entry["rev"]):
+                if note_id in self.saver.conflicts():
+                    self._keep_parked_text(note_id, entry)
+                self._destroy_editor_text(entry["text"])
+                entry = None
+            if entry is not None or keep:
+                if not keep:
+                    self._destroy_editor_text(self.text)
+                self._mount_editor(entry)
+            if entry is not None:
+                return
+        self._evict_editor(note_id)
+
+        if note_id in self.saver.unsaved_ids():
+            self.saver.flush()
+        rev = self.store.note_rev(note_id)
+        mtime = self.store.mtime(note_id)
+        content = self.note_cache.get(note_id, mtime)
+        if content is not None:
+            self.saver.remember(note_id, content)
+            size = len(content)
+        else:
+            size = self.store.size(note_id)
+            if size <= LOAD_FIRST_CHARS or self.store.journal_size(note_id)[0]:
+                content = self._read_note(note_id)
+                self.note_cache.put(note_id, mtime, content)
+        if content is not None and size <= LOAD_FIRST_CHARS:
+            self._reset_journal(note_id, content, rev)
+            self._insert_loaded("1.0", content, replace=True)
+            self.text.edit_reset()
+            self.text.edit_modified(False)
+            return
+
+        # Show the first screen now and stream the rest while the editor stays interactive.
+        if content is not None:
+            first = content[:LOAD_FIRST_CHARS]
+        else:
+            first = self.store.read_range(note_id, 0, LOAD_FIRST_CHARS)
+        self._reset_journal(note_id, first, rev)
+        self._journal["size"] = size
+        self._insert_loaded("1.0", first, replace=True)
+        self.text.edit_reset()
+        self.text.mark_set("sticky_load", "end-1c")
+        self.text.mark_gravity("sticky_load", "right")
+        self.text.edit_modified(False)
+        self._loading = {
+            "note_id": note_id,
+            "offset": len(first),
+            "size": size,
+            "source": content,
+            "save_after": False,
+            "job": self.root.after_idle(self._load_next_chunk),
+        }
+
+    def _park_editor(self) -> None:
+        note_id = self._journal["note_id"]
+        self._editor_pool.pop(note_id, None)
+        self._editor_pool[note_id] = {"text": self.text, "journal": self._journal, "rev": self.store.note_rev(note_id)}
+        self.text.pack_forget()
+
+        parked_chars = sum(entry["journal"]["size"] for entry in self._editor_pool.values())
+        while self._editor_pool and (len(self._editor_pool) > EDITOR_POOL_SIZE or parked_chars > EDITOR_POOL_CHARS):
+            _note_id, entry = self._editor_pool.popitem(last=False)
+            parked_chars -= entry["journal"]["size"]
+            self._destroy_editor_text(entry["text"])
+
+    def _editor_current(self, note_id: str, rev: int) -> bool:
+        # Editor text is valid only while the stored note is still the version it was based on, or one this
+        # window saved since.
+        if note_id in self.saver.unsaved_ids():
+            self.saver.flush()
+        if not self.store.exists(note_id):
+            return False
+        return self.store.note_rev(note_id) in (rev, self.saver.written_rev(note_id))
+
+    def _keep_parked_text(self, note_id: str, entry: dict) -> None:
+        # A parked editor's refused save becomes a note of its own next to the other version.
+        self.note_ids.insert_front(self._create_note_file(entry["text"].get("1.0", "end-1c")))
+        self.saver.discard(note_id)
+
+    def _release_editor(self) -> None:
+        # The live widget no longer matches its note, so the next load reuses it instead of parking it.
+        self._cancel_streaming_load()
+        self._journal = {"note_id": "", "rev": 0, "ops": [], "size": 0, "ok": False, "suspended": 0}
+
+    def _mount_editor(self, entry: dict | None) -> None:
+        # A parked editor comes back with its undo history, cursor and scroll position intact.
+        if entry is None:
+            self.text = self._create_editor_text()
+            self._journal = {"note_id": "", "rev": 0, "ops": [], "size": 0, "ok": False, "suspended": 0}
+        else:
+            self.text = entry["text"]
+            self._journal = entry["journal"]
+        self.text.pack(side="left", fill="both", expand=True, padx=(0, EDITOR_SIDEBAR_GAP * self._ui_scale))
         self.text.edit_modified(False)
 
+    def _evict_editor(self, note_id: str) -> None:
+        entry = self._editor_pool.pop(note_id, None)
+        if entry is not None:
+            self._destroy_editor_text(entry["text"])
+
+    def _destroy_editor_text(self, text: tk.Text) -> None:
+        name = str(text)
+        text.destroy()
+        # The journal proxy took over the widget's command name, so it has to be removed separately.
+        self.root.tk.deletecommand(name)
+
+    def _insert_loaded(self, index: str, content: str, replace: bool = False) -> None:
+        self._journal["suspended"] += 1
+        try:
+            if replace:
+                self.text.delete("1.0", "end")
+            self.text.insert(index, content)
+        finally:
+            self._journal["suspended"] -= 1
+
+    def _load_next_chunk(self) -> None:
+        loading = self._loading
+        if loading is None:
+            return
+        loading["job"] = None
+        if loading["source"] is not None:
+            chunk = loading["source"][loading["offset"] : loading["offset"] + LOAD_CHUNK_CHARS]
+        else:
+            chunk = self.store.read_range(loading["note_id"], loading["offset"], LOAD_CHUNK_CHARS)
+        if chunk:
+            was_modified = self.text.edit_modified()
+            # The mark has right gravity, so it stays after user text typed at the end of the loaded part.
+            self._insert_loaded("sticky_load", chunk)
+            if not was_modified:
+                self.text.edit_modified(False)
+            if any(ord(ch) > 0xFFFF for ch in chunk):
+                self._journal["ok"] = False
+            loading["offset"] += len(chunk)
+
+        if chunk and loading["offset"] < loading["size"]:
+            loading["job"] = self.root.after_idle(self._load_next_chunk)
+            return
+
+        self._loading = None
+        self.text.mark_unset("sticky_load")
+        if loading["save_after"]:
+            self._schedule_save()
+
+    def _finish_streaming_load(self) -> None:
+        while self._loading is not None:
+            if self._loading["job"] is not None:
+                self.root.after_cancel(self._loading["job"])
+                self._loading["job"] = None
+            self._load_next_chunk()
+
+    def _cancel_streaming_load(self) -> None:
+        if self._loading is None:
+            return
+        if self._loading["job"] is not None:
+            self.root.after_cancel(self._loading["job"])
+        self._loading = None
+        self.text.mark_unset("sticky_load")
+
+    def _read_note(self, note_id: str) -> str:
+        if note_id in self.saver.unsaved_ids():
+            self.saver.flush()
+        content = self.store.read(note_id)
+        self.saver.remember(note_id, content)
+        return content
+
+    def _note_previews(self, note_ids: list[str]) -> dict[str, str]:
+        previews = self.store.previews(note_ids)
+        # Saves still queued for the writer thread are not in the index yet.
+        for note_id in self.saver.unsaved_ids():
+            if note_id in previews:
+                hint = self.saver.preview_hint(note_id)
+                if hint is not None:
+                    previews[note_id] = hint
+        return previews
+
     def _save_current_note(self) -> None:
-        write_file(note_file(self.current_note_id), self.text.get("1.0", "end-1c"))
+        note_id = self._journal["note_id"]
+        if not note_id:
+            return
+        # The stored body is what the rest of the note streams from, so it must not change mid-load.
+        self._finish_streaming_load()
+        self.note_cache.discard(note_id)
+        if not self._journal["ok"]:
+            content = self.text.get("1.0", "end-1c")
+            self.saver.submit(note_id, content, self._journal["rev"])
+            self._reset_journal(note_id, content, self._journal["rev"])
+            self._queue_reindex()
+        elif self._journal["ops"]:
+            head = self.text.get("1.0", f"1.0 + {PREVIEW_LINES * 8} lines")
+            self.saver.submit_edits(
+                note_id, self._journal["ops"], self._journal["size"], build_preview(head), self._journal["rev"]
+            )
+            self._journal["ops"] = []
+            self._queue_reindex()
+
+    def _reset_journal(self, note_id: str, content: str, rev: int) -> None:
+        # Tk counts characters outside the BMP differently from Python, so such notes always save in full.
+        self._journal = {
+            "note_id": note_id,
+            "rev": rev,
+            "ops": [],
+            "size": len(content),
+            "ok": not any(ord(ch) > 0xFFFF for ch in content),
+            "suspended": 0,
+        }
+
+    def _install_edit_journal(self, text: tk.Text) -> None:
+        # Route the widget command through a proxy so every insert/delete (typing, paste, undo) is observed.
+        widget = str(text)
+        original = f"{widget}_journaled"
+        self.root.tk.call("rename", widget, original)
+        self.root.tk.createcommand(widget, lambda *args: self._journal_dispatch(original, args))
+
+    def _journal_dispatch(self, original: str, args: tuple):
+        edit = None
+        if args and args[0] in ("insert", "delete", "replace") and not self._journal["suspended"]:
+            if self._journal["ok"]:
+                try:
+                    edit = self._journal_capture(original, args)
+                except (tk.TclError, ValueError):
+                    self._journal["ok"] = False
+        result = self.root.tk.call((original,) + args)
+        if edit is not None:
+            self._record_edit(*edit)
+        return result
+
+    def _journal_offset(self, original: str, index) -> int:
+        call = self.root.tk.call
+        if call(original, "compare", index, ">", "end-1c"):
+            index = "end-1c"
+        return int(call(original, "count", "-chars", "1.0", index) or 0)
+
+    def _journal_capture(self, original: str, args: tuple) -> tuple[int, int, str] | None:
+        command = args[0]
+        if command == "insert":
+            start = end = self._journal_offset(original, args[1])
+            text = "".join(str(chunk) for chunk in args[2::2])
+        elif command == "delete":
+            if len(args) > 3:
+                # Multi-range deletes are rare; fall back to a full save rather than modelling them.
+                self._journal["ok"] = False
+                return None
+            start = self._journal_offset(original, args[1])
+            end = self._journal_offset(original, args[2] if len(args) > 2 else f"{args[1]}+1c")
+            text = ""
+        else:
+            start = self._journal_offset(original, args[1])
+            end = self._journal_offset(original, args[2])
+            text = "".join(str(chunk) for chunk in args[3::2])
+
+        remove = max(0, end - start)
+        if not text and not remove:
+            return None
+        if any(ord(ch) > 0xFFFF for ch in text):
+            self._journal["ok"] = False
+            return None
+        return start, remove, text
+
+    def _record_edit(self, start: int, remove: int, text: str) -> None:
+        self._journal["size"] += len(text) - remove
+
+        ops = self._journal["ops"]
+        if ops:
+            last = ops[-1]
+            if not remove and last[0] + len(last[2]) == start:
+                last[2] += text
+                return
+            if not text and last[2] and start + remove == last[0] + len(last[2]) and start >= last[0]:
+                last[2] = last[2][: start - last[0]]
+                return
+        ops.append([start, remove, text])
 
     def _schedule_save(self) -> None:
         if self.save_job is not None:
@@ -859,6 +2920,9 @@ class StickyNoteApp:
 
     def _flush_save(self) -> None:
         self.save_job = None
+        if self._loading is not None:
+            self._loading["save_after"] = True
+            return
         self._save_current_note()
 
     def _on_modified(self, _event=None):
@@ -867,9 +2931,26 @@ class StickyNoteApp:
             self._schedule_save()
 
     def _persist_state(self) -> None:
-        save_state(self.note_ids, self.current_note_id)
+        # Callers only mark the state dirty; bursts of changes land in one deferred write.
+        if self._state_job is None:
+            self._state_job = self.root.after(STATE_SAVE_DELAY_MS, self._flush_state)
+
+    def _flush_state(self) -> None:
+        if self._state_job is not None:
+            self.root.after_cancel(self._state_job)
+            self._state_job = None
+        if self._saved_state[1] == self.current_note_id and self._saved_state[0] == self.note_ids.ids():
+            return
+        try:
+            save_state(self.store, self.note_ids, self.current_note_id)
+        except sqlite3.Error as exc:
+            print(f"sticky-note: saving state failed: {exc}", file=sys.stderr)
+            self._persist_state()
+            return
+        self._saved_state = (self.note_ids.ids(), self.current_note_id)
 
     def _apply_editor_view(self, note_id: str) -> None:
+        self._invalidate_geometry()
         self.in_gallery = False
         self.current_note_id = note_id
         self._persist_state()
@@ -880,11 +2961,11 @@ class StickyNoteApp:
             self.editor_frame.pack(fill="both", expand=True)
         self._load_note(note_id)
         self.text.focus_set()
-        self.root.update_idletasks()
         self._last_editor_text_rect = self._widget_rect(self.text)
-        self._last_editor_window_size = (self.root.winfo_width(), self.root.winfo_height())
+        self._last_editor_window_size = self._geometry_snapshot()["size"]
 
     def _apply_gallery_view(self, sync_refresh: bool = False) -> None:
+        self._invalidate_geometry()
         self.in_gallery = True
         self.gallery_edit_mode = False
         self._update_gallery_controls()
@@ -894,21 +2975,22 @@ class StickyNoteApp:
         self.editor_frame.pack_forget()
         if not self.gallery_frame.winfo_ismapped():
             self.gallery_frame.pack(fill="both", expand=True)
+        # Scroll first so a virtualized gallery materializes the first rows the zoom-out animates to.
+        self.thumb_canvas.yview_moveto(0)
         if sync_refresh:
             self._gallery_refresh_pending = False
             self._gallery_refresh_force = False
             self._refresh_gallery(force=True)
         else:
             self._queue_gallery_refresh(force=True)
-        self.thumb_canvas.yview_moveto(0)
-        self.root.update_idletasks()
+        self._geometry_snapshot()
 
     def _create_new_note(self) -> None:
         if self.animating:
             return
         self._flush_if_pending()
         new_id = self._create_note_file("")
-        self.note_ids.insert(0, new_id)
+        self.note_ids.insert_front(new_id)
         self.current_note_id = new_id
         self._persist_state()
         self._show_editor(new_id)
@@ -923,10 +3005,7 @@ class StickyNoteApp:
         if note_id not in self.note_ids or self.animating:
             return
 
-        source_rect = None
-        frame = self.thumb_frames.get(note_id)
-        if frame is not None and frame.winfo_exists():
-            source_rect = self._widget_rect(frame)
+        source_rect = self._thumb_rect(note_id)
 
         if self.gallery_edit_mode:
             self.gallery_edit_mode = False
@@ -955,24 +3034,14 @@ class StickyNoteApp:
             self._apply_gallery_view()
 
     def _visual_order(self, columns: int) -> list[str]:
-        if not self.note_ids:
-            return []
         if self.current_note_id not in self.note_ids:
-            return self.note_ids.copy()
-
-        others = [nid for nid in self.note_ids if nid != self.current_note_id]
-        total = len(self.note_ids)
-        center_idx = min(total - 1, max(0, columns // 2))
-        ordered: list[str | None] = [None] * total
-        ordered[center_idx] = self.current_note_id
-
-        idx = 0
-        for slot in range(total):
-            if ordered[slot] is None:
-                ordered[slot] = others[idx]
-                idx += 1
+            return self.note_ids.ids()
 
-        return [nid for nid in ordered if nid is not None]
+        # The active note sits in the middle of the first row; everything else keeps its order around it.
+        center_idx = min(len(self.note_ids) - 1, max(0, columns // 2))
+        ordered = [nid for nid in self.note_ids if nid != self.current_note_id]
+        ordered.insert(center_idx, self.current_note_id)
+        return ordered
 
     def _refresh_gallery(self, force: bool = False) -> None:
         canvas_width = max(self._effective_gallery_canvas_width(), 1)
@@ -988,91 +3057,221 @@ class StickyNoteApp:
         thumb_h = max(120, int(thumb_w / WINDOW_RATIO))
 
         order = self._visual_order(columns)
+        if self._search_hits is not None:
+            # Search results keep their ranking instead of the usual centered layout.
+            present = set(order)
+            order = [nid for nid in self._search_hits if nid in present]
         layout_key = (canvas_width, columns, thumb_w, thumb_h, tuple(order), self.gallery_edit_mode)
         if not force and layout_key == self._gallery_layout_key:
             return
         self._gallery_layout_key = layout_key
         self._last_thumb_canvas_width = canvas_width
 
-        for child in self.thumb_container.winfo_children():
-            child.destroy()
-        self.thumb_frames = {}
-
-        for col in range(columns):
-            self.thumb_container.grid_columnconfigure(col, weight=1)
-
-        for index, note_id in enumerate(order):
-            row = index // columns
-            col = index % columns
-            frame = tk.Canvas(
-                self.thumb_container,
-                bg=GALLERY_BG,
-                width=thumb_w,
-                height=thumb_h,
-                highlightthickness=0,
-                bd=0,
-                cursor="hand2",
-            )
-            frame.grid(row=row, column=col, padx=pad // 2, pady=pad // 2, sticky="n")
-            self.thumb_frames[note_id] = frame
-
-            self._rounded_rect(
-                frame,
-                1,
-                1,
-                thumb_w - 1,
-                thumb_h - 1,
-                radius=THUMB_RADIUS,
-                fill=THUMB_BG,
-                outline="",
-                width=0,
-            )
+        # Rows are laid out arithmetically so the scroll region is known without materializing them.
+        row_h = thumb_h + pad
+        total_h = max(1, -(-len(order) // columns) * row_h)
+        self.thumb_canvas.configure(scrollregion=(0, 0, canvas_width, total_h))
 
-            preview = self._thumbnail_text(note_id)
-            text_id = frame.create_text(
-                12,
-                12,
-                text=preview,
-                justify="left",
-                anchor="nw",
-                fill=NOTE_FG,
-                font=("Iosevka", 11),
-                width=max(80, thumb_w - 24),
-            )
+        self._gallery_order = order
+        self._gallery_metrics = (columns, thumb_w, thumb_h, pad, canvas_width / columns)
+        # Width-only changes just move the existing cards; previews are re-read on forced refreshes.
+        if force:
+            self._gallery_previews = {}
+        self._sync_gallery_window()
+
+    def _visible_gallery_slice(self) -> tuple[int, list[str]]:
+        order = self._gallery_order
+        if len(order) <= GALLERY_VIRTUAL_MIN_NOTES or self._gallery_metrics is None:
+            return 0, order
+
+        columns, _thumb_w, thumb_h, pad, _cell_w = self._gallery_metrics
+        row_h = thumb_h + pad
+        top = self.thumb_canvas.canvasy(0)
+        height = self.thumb_canvas.winfo_height()
+        if height <= 1:
+            height = WINDOW_HEIGHT
+        first_row = max(0, int(top // row_h) - GALLERY_OVERSCAN_ROWS)
+        last_row = int((top + height) // row_h) + GALLERY_OVERSCAN_ROWS
+        base = first_row * columns
+        return base, order[base:(last_row + 1) * columns]
+
+    def _sync_gallery_window(self) -> None:
+        if self._gallery_metrics is None:
+            return
+        columns, thumb_w, thumb_h, pad, cell_w = self._gallery_metrics
+        base, visible = self._visible_gallery_slice()
+
+        missing = [nid for nid in visible if nid not in self._gallery_previews]
+        if missing:
+            self._gallery_previews.update(self._note_previews(missing))
+
+        # Thumbnails that scrolled out (or whose note is gone) are recycled for newly visible notes.
+        canvas = self.thumb_canvas
+        live = set(visible)
+        for note_id in [nid for nid in self.thumb_items if nid not in live]:
+            items = self.thumb_items.pop(note_id)
+            canvas.dtag(items["slot"], f"note:{note_id}")
+            canvas.itemconfigure(items["slot"], state="hidden")
+            self._thumb_pool.append(items)
+
+        for offset, note_id in enumerate(visible):
+            items = self.thumb_items.get(note_id)
+            if items is None:
+                items = self._thumb_pool.pop() if self._thumb_pool else self._create_thumbnail()
+                canvas.addtag_withtag(f"note:{note_id}", items["slot"])
+                canvas.itemconfigure(items["slot"], state="normal")
+                items["preview"] = None
+                self.thumb_items[note_id] = items
+            slot = items["slot"]
+
+            index = base + offset
+            cell = (int(cell_w * (index % columns + 0.5)), (index // columns) * (thumb_h + pad) + pad // 2)
+            if items["cell"] != cell:
+                if items["cell"] is not None:
+                    canvas.move(slot, cell[0] - items["cell"][0], cell[1] - items["cell"][1])
+                items["cell"] = cell
+
+            if items["size"] != (thumb_w, thumb_h):
+                x1 = cell[0] - thumb_w // 2
+                y1 = cell[1]
+                canvas.coords(
+                    items["rect"],
+                    *_rounded_rect_points(x1 + 1, y1 + 1, x1 + thumb_w - 1, y1 + thumb_h - 1, THUMB_RADIUS),
+                )
+                canvas.coords(items["text"], x1 + 12, y1 + 12)
+                canvas.itemconfigure(items["text"], width=max(80, thumb_w - 24))
+                canvas.delete(f"{slot}&&delete")
+                items["badge"] = False
+                items["preview"] = None
+                items["size"] = (thumb_w, thumb_h)
+
+            preview = self._gallery_previews.get(note_id, "(empty)")
+            if items["preview"] != preview:
+                canvas.itemconfigure(items["text"], text=self._fit_preview(preview, thumb_w, thumb_h))
+                items["preview"] = preview
+
+            selected = note_id in self._gallery_selection
+            if items["selected"] != selected:
+                canvas.itemconfigure(items["rect"], outline=ICON_HOVER if selected else "", width=3 if selected else 0)
+                items["selected"] = selected
+
+            if self.gallery_edit_mode and not items["badge"]:
+                self._add_delete_badge(items, note_id)
+                items["badge"] = True
+            elif not self.gallery_edit_mode and items["badge"]:
+                canvas.delete(f"{slot}&&delete")
+                items["badge"] = False
+
+        if self.in_gallery:
+            self.prefetcher.request(visible)
+
+        # Keep roughly one spare screen of thumbnails around for scrolling; drop the rest.
+        spare = max(len(visible), columns)
+        while len(self._thumb_pool) > spare:
+            canvas.delete(self._thumb_pool.pop()["slot"])
+
+    def _create_thumbnail(self) -> dict:
+        self._thumb_slot_seq += 1
+        slot = f"slot{self._thumb_slot_seq}"
+        rect_id = self._rounded_rect(
+            self.thumb_canvas,
+            1,
+            1,
+            2,
+            2,
+            radius=THUMB_RADIUS,
+            fill=THUMB_BG,
+            outline="",
+            width=0,
+        )
+        text_id = self.thumb_canvas.create_text(
+            12,
+            12,
+            text="",
+            justify="left",
+            anchor="nw",
+            fill=NOTE_FG,
+            font=self.thumb_font,
+        )
+        for item in (rect_id, text_id):
+            self.thumb_canvas.addtag_withtag(slot, item)
+            self.thumb_canvas.addtag_withtag("thumb", item)
+        return {
+            "slot": slot,
+            "rect": rect_id,
+            "text": text_id,
+            "size": None,
+            "preview": None,
+            "cell": None,
+            "badge": False,
+            "selected": False,
+        }
 
-            frame.bind("<Button-1>", lambda _e, nid=note_id: self._on_thumbnail_click(nid))
-            frame.tag_bind(text_id, "<Button-1>", lambda _e, nid=note_id: self._on_thumbnail_click(nid))
+    def _add_delete_badge(self, items: dict, note_id: str) -> None:
+        thumb_w, _thumb_h = items["size"]
+        x2 = items["cell"][0] - thumb_w // 2 + thumb_w
+        y1 = items["cell"][1]
+        tags = (items["slot"], f"note:{note_id}", "thumb", "delete")
+        self.thumb_canvas.create_oval(
+            x2 - 28,
+            y1 + 8,
+            x2 - 8,
+            y1 + 28,
+            fill=NOTE_FG,
+            outline="",
+            width=0,
+            tags=tags,
+        )
+        self.thumb_canvas.create_text(
+            x2 - 18,
+            y1 + 18,
+            text="✕",
+            fill=NOTE_BG,
+            font=("Iosevka", 11, "bold"),
+            tags=tags,
+        )
 
+    def _fit_preview(self, preview: str, thumb_w: int, thumb_h: int) -> str:
+        # Canvas text is not clipped to the card, so trim the preview to the lines that fit.
+        line_h = max(1, self.thumb_font.metrics("linespace"))
+        max_lines = max(1, (thumb_h - 24) // line_h)
+        per_line = max(1, int((thumb_w - 24) / max(1, self.thumb_font.measure("0")) * 0.85))
+        kept: list[str] = []
+        used = 0
+        for line in preview.split("\n"):
+            need = max(1, -(-len(line) // per_line))
+            if used + need > max_lines:
+                room = max_lines - used
+                if room > 0:
+                    kept.append(line[: room * per_line - 1] + "…")
+                elif kept:
+                    kept[-1] = kept[-1] + " …"
+                break
+            kept.append(line)
+            used += need
+        return "\n".join(kept)
+
+    def _on_thumb_canvas_click(self, event):
+        if not self.in_gallery or self.animating:
+            return None
+        x = self.thumb_canvas.canvasx(event.x)
+        y = self.thumb_canvas.canvasy(event.y)
+        for item in reversed(self.thumb_canvas.find_overlapping(x, y, x, y)):
+            tags = self.thumb_canvas.gettags(item)
+            note_id = next((tag[5:] for tag in tags if tag.startswith("note:")), None)
+            if note_id is None:
+                continue
+            if "delete" in tags:
+                return self._on_delete_click(event, note_id)
             if self.gallery_edit_mode:
-                del_bg = frame.create_oval(
-                    thumb_w - 28,
-                    8,
-                    thumb_w - 8,
-                    28,
-                    fill=NOTE_FG,
-                    outline="",
-                    width=0,
-                    tags=("delete",),
-                )
-                del_txt = frame.create_text(
-                    thumb_w - 18,
-                    18,
-                    text="✕",
-                    fill=NOTE_BG,
-                    font=("Iosevka", 11, "bold"),
-                    tags=("delete",),
-                )
-                frame.tag_bind(del_bg, "<Button-1>", lambda event, nid=note_id: self._on_delete_click(event, nid))
-                frame.tag_bind(del_txt, "<Button-1>", lambda event, nid=note_id: self._on_delete_click(event, nid))
+                self._select_thumbnail(note_id, extend=bool(event.state & 0x0001))
+                return "break"
+            self._on_thumbnail_click(note_id)
+            return "break"
+        return None
 
     def _thumbnail_text(self, note_id: str) -> str:
-        content = read_file(note_file(note_id)).strip()
-        if not content:
-            return "(empty)"
-
-        lines = [line.rstrip() for line in content.splitlines() if line.strip()]
-        preview = "\n".join(lines[:6])
-        return preview[:360]
+        return self._note_previews([note_id]).get(note_id, "(empty)")
 
     def _on_thumbnail_click(self, note_id: str) -> None:
         if self.gallery_edit_mode:
@@ -1084,32 +3283,111 @@ class StickyNoteApp:
         if note_id not in self.note_ids:
             return "break"
 
-        path = note_file(note_id)
-        if path.exists():
-            path.unlink()
+        self.saver.discard(note_id)
+        self.store.delete(note_id)
+        self._drop_notes([note_id])
+        return "break"
 
-        self.note_ids = [nid for nid in self.note_ids if nid != note_id]
+    def _drop_notes(self, note_ids: list[str]) -> None:
+        if self._journal["note_id"] in note_ids:
+            self._release_editor()
+        for note_id in note_ids:
+            self.note_ids.remove(note_id)
+            self.note_cache.discard(note_id)
+            self._evict_editor(note_id)
+        self._gallery_selection.difference_update(note_ids)
 
         if not self.note_ids:
             new_id = self._create_note_file("")
-            self.note_ids = [new_id]
+            self.note_ids.insert_front(new_id)
             self.current_note_id = new_id
-        elif self.current_note_id == note_id:
-            self.current_note_id = self.note_ids[0]
+        elif self.current_note_id not in self.note_ids:
+            self.current_note_id = self.note_ids.front()
 
         self._persist_state()
+        self._update_gallery_controls()
         self._queue_gallery_refresh(force=True)
+
+    def _select_thumbnail(self, note_id: str, extend: bool = False) -> None:
+        order = self._gallery_order
+        if extend and self._selection_anchor in order and note_id in order:
+            first, last = sorted((order.index(self._selection_anchor), order.index(note_id)))
+            self._gallery_selection.update(order[first : last + 1])
+        else:
+            self._gallery_selection ^= {note_id}
+            self._selection_anchor = note_id
+        self._update_gallery_controls()
+        self._sync_gallery_window()
+
+    def _on_select_all(self, event=None):
+        if not (self.in_gallery and self.gallery_edit_mode) or (event is not None and event.widget is self.search_entry):
+            return None
+        if self._gallery_selection.issuperset(self._gallery_order):
+            self._gallery_selection.clear()
+        else:
+            self._gallery_selection.update(self._gallery_order)
+        self._update_gallery_controls()
+        self._sync_gallery_window()
         return "break"
 
+    def _on_delete_key(self, event=None):
+        if event is not None and event.widget is self.search_entry:
+            return None
+        self._bulk_action(self._delete_selected)
+        return None
+
+    def _selected_in_order(self) -> list[str]:
+        # The order on screen (active note centred, search ranking) decides which note a merge keeps.
+        shown = [note_id for note_id in self._gallery_order if note_id in self._gallery_selection]
+        seen = set(shown)
+        return shown + [note_id for note_id in self.note_ids if note_id in self._gallery_selection and note_id not in seen]
+
+    def _bulk_action(self, action) -> None:
+        if not (self.in_gallery and self.gallery_edit_mode) or self.animating:
+            return
+        selected = self._selected_in_order()
+        if selected:
+            action(selected)
+
+    # Each bulk action is one store transaction, one state write and one gallery refresh.
+    def _delete_selected(self, note_ids: list[str]) -> None:
+        for note_id in note_ids:
+            self.saver.discard(note_id)
+        self.store.delete_many(note_ids)
+        self._drop_notes(note_ids)
+
+    def _archive_selected(self, note_ids: list[str]) -> None:
+        self.saver.flush()
+        self.store.archive(note_ids)
+        self._drop_notes(note_ids)
+
+    def _merge_selected(self, note_ids: list[str]) -> None:
+        if len(note_ids) < 2:
+            return
+        self.saver.flush()
+        target = self.store.merge(note_ids)
+        self._queue_reindex()
+        self._gallery_previews.pop(target, None)
+        self._evict_editor(target)
+        if self._journal["note_id"] == target:
+            self._release_editor()
+        self._drop_notes(note_ids[1:])
+        self._gallery_selection = {target}
+        self._selection_anchor = target
+        self._update_gallery_controls()
+
     def _enter_gallery_edit_mode(self) -> None:
         if self.animating:
             return
         self.gallery_edit_mode = True
+        self._gallery_selection.clear()
+        self._selection_anchor = None
         self._update_gallery_controls()
         self._queue_gallery_refresh(force=True)
 
     def _exit_gallery_edit_mode(self) -> None:
         self.gallery_edit_mode = False
+        self._gallery_selection.clear()
         self._update_gallery_controls()
         self._queue_gallery_refresh(force=True)
 
@@ -1117,16 +3395,26 @@ class StickyNoteApp:
         if self.gallery_edit_mode:
             if not self.gallery_cancel_button.winfo_ismapped():
                 self.gallery_cancel_button.pack(side="left")
+                for button in self.gallery_action_buttons:
+                    button.pack(side="left", padx=(6, 0))
+                self.selection_label.pack(side="left", padx=(12, 0))
+            count = len(self._gallery_selection)
+            self.selection_label.configure(text=f"{count} selected" if count else "")
             self._set_icon_color(self.gallery_edit_button, ICON_HOVER)
         else:
             if self.gallery_cancel_button.winfo_ismapped():
                 self.gallery_cancel_button.pack_forget()
+                for button in self.gallery_action_buttons:
+                    button.pack_forget()
+                self.selection_label.pack_forget()
             self._set_icon_color(self.gallery_edit_button, NOTE_FG)
 
     def _flush_if_pending(self) -> None:
+        pending = self.save_job is not None or (self._loading is not None and self._loading["save_after"])
         if self.save_job is not None:
             self.root.after_cancel(self.save_job)
             self.save_job = None
+        if pending:
             self._save_current_note()
 
     def _on_escape(self, _event=None):
@@ -1134,13 +3422,77 @@ class StickyNoteApp:
         return "break"
 
     def _close(self) -> None:
+        # A resident instance stays alive in the background so the next launch is just a map request.
+        if self.resident:
+            self._hide_window()
+            return
+        self._shutdown()
+
+    def _shutdown(self) -> None:
+        if self.control is not None:
+            self.root.tk.deletefilehandler(self.control)
+            self.control.close()
+            CONTROL_SOCKET.unlink(missing_ok=True)
+            self.control = None
+        if self.watcher is not None:
+            self.root.tk.deletefilehandler(self.watcher)
+            self.watcher.close()
+            self.watcher = None
+        for job in (self._watch_job, self._external_job, self._resize_frame_job, self._resize_settle_job, self._reindex_job):
+            if job is not None:
+                self.root.after_cancel(job)
+        self._finish_animation()
         if not self.in_gallery:
             self._flush_if_pending()
-        self._persist_state()
+        self._flush_state()
+        self.prefetcher.close()
+        self.saver.close()
+        self.store.close()
         self.root.destroy()
 
 
-if __name__ == "__main__":
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Sticky note widget")
+    parser.add_argument("--resident", action="store_true", help="keep running in the background and listen for commands")
+    parser.add_argument("--send", choices=CONTROL_COMMANDS, help="send a command to the resident instance and exit")
+    commands = parser.add_subparsers(dest="command")
+    listing = commands.add_parser("list", help="list notes in gallery order")
+    listing.add_argument("--archived", action="store_true", help="list archived notes instead")
+    read = commands.add_parser("read", help="print a note (the active one by default)")
+    read.add_argument("--id", help="note id or unique prefix")
+    append = commands.add_parser("append", help="append text from the arguments or stdin")
+    append.add_argument("--id", help="note id or unique prefix")
+    append.add_argument("text", nargs="*")
+    create = commands.add_parser("create", help="create a note from the arguments or stdin")
+    create.add_argument("text", nargs="*")
+    unarchive = commands.add_parser("unarchive", help="move an archived note back into the gallery")
+    unarchive.add_argument("id", help="note id or unique prefix")
+    args = parser.parse_args()
+
+    if args.command:
+        return run_cli(args)
+
+    if args.send:
+        reply = send_command(args.send)
+        if reply is None:
+            return 1
+        if reply != "ok":
+            print(f"sticky-note: {reply}", file=sys.stderr)
+            return 1
+        return 0
+
+    state = control_socket_state()
+    if state == "live":
+        # One window per session: a second launch brings up the running one instead.
+        send_command("show")
+        return 0
+    control = open_control_socket(stale=state == "stale")
+
     root = tk.Tk()
-    StickyNoteApp(root)
+    StickyNoteApp(root, control, resident=args.resident and control is not None)
     root.mainloop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())